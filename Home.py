@@ -1,9 +1,7 @@
 import streamlit as st
 import base64
 import plotly.graph_objects as go
-import plotly.express as px
 from datetime import datetime
-import random
 
 def get_base64_of_bin_file(bin_file):
     """
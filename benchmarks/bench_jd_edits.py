@@ -0,0 +1,92 @@
+"""
+Rescoring time for job description edits: full cosine scoring against incremental updates.
+
+Usage:
+    python benchmarks/bench_jd_edits.py --synthetic 10000
+    python benchmarks/bench_jd_edits.py --corpus path/to/resumes --edits 50
+
+A corpus model is fitted on the resumes, then a job description is edited
+repeatedly (words added, removed and replaced, as a recruiter tweaking it
+would). After every edit the resumes are scored both ways: transforming the
+new description and computing cosine similarity against every resume, and
+applying only the changed term weights to the previous scores with
+scoring.IncrementalScores. Exits with status 1 if the scores ever differ.
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scoring
+import resume_processing
+from compare_engines import SKILLS, FILLER, synthetic_documents
+from sklearn.metrics.pairwise import cosine_similarity
+
+
+def edit_job_description(words, rng):
+    """
+    Function to apply one small random edit to a tokenized job description.
+    """
+    words = list(words)
+    action = rng.integers(3)
+    position = int(rng.integers(len(words) + 1))
+    if action == 0 or len(words) < 10:
+        words[position:position] = rng.choice(SKILLS + FILLER, size=rng.integers(1, 4)).tolist()
+    elif action == 1:
+        del words[position:position + int(rng.integers(1, 4))]
+    else:
+        words[min(position, len(words) - 1)] = str(rng.choice(SKILLS))
+    return words
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--synthetic", type=int, default=10000, help="Generate this many synthetic resumes")
+    parser.add_argument("--corpus", help="Directory of resumes (.pdf or .txt)")
+    parser.add_argument("--edits", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    if args.corpus:
+        resumes = scoring.load_corpus_texts(resume_processing.find_resume_files(args.corpus))
+    else:
+        resumes = synthetic_documents(args.synthetic, rng)
+    vectorizer = scoring.fit_corpus_model(resumes)["vectorizer"]
+    matrix = vectorizer.transform(resumes)
+    words = synthetic_documents(1, rng, n_words=(60, 120))[0].split()
+    print(f"{len(resumes)} resumes, {matrix.nnz:,} stored weights, {args.edits} edits")
+
+    scores = scoring.IncrementalScores(matrix, scoring.query_weights(vectorizer, [words]))
+    full_times, incremental_times, changed, max_diff = [], [], [], 0.0
+    for _ in range(args.edits):
+        words = edit_job_description(words, rng)
+
+        start = time.perf_counter()
+        full = cosine_similarity(vectorizer.transform([words]), matrix)[0]
+        full_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        incremental = scores.update(scoring.query_weights(vectorizer, [words])).scores
+        incremental_times.append(time.perf_counter() - start)
+
+        changed.append(scores.last_changed)
+        max_diff = max(max_diff, float(np.abs(full - incremental).max()))
+
+    full_ms = statistics.median(full_times) * 1000
+    incremental_ms = statistics.median(incremental_times) * 1000
+    print(f"{'Rescoring':<16}{'Median (ms)':>14}")
+    print(f"{'Full':<16}{full_ms:>14.2f}")
+    print(f"{'Incremental':<16}{incremental_ms:>14.2f}")
+    print(f"Speedup: {full_ms / incremental_ms:.1f}x, median changed terms {statistics.median(changed):.0f}, max score difference {max_diff:.2e}")
+    return 1 if max_diff > 1e-9 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""
+Bulk extraction throughput: serial processing against the process pool at several worker counts.
+
+Usage:
+    python benchmarks/bench_parallel_extraction.py --synthetic 100
+    python benchmarks/bench_parallel_extraction.py --corpus path/to/resumes --workers 1 2 4 8
+
+Every resume is extracted with pdfplumber and preprocessed through
+resume_processing.process_resumes, first serially and then in parallel with
+each worker count (by default powers of two up to the number of CPU cores).
+The pool is started and warmed up before it is timed, so the numbers show
+steady-state throughput rather than process start-up. The text cache is not
+used. Exits with status 1 if any run produces different text.
+"""
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import resume_processing
+from compare_engines import synthetic_documents
+
+
+def pdf_string(text):
+    return "(" + text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ")"
+
+
+def synthetic_pdf(words, words_per_line=12, lines_per_page=50):
+    """
+    Function to lay words out as a plain multi-page PDF in the built-in Helvetica font.
+    """
+    lines = [" ".join(words[i:i + words_per_line]) for i in range(0, len(words), words_per_line)]
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    n_pages = len(pages)
+    # Objects: 1 catalog, 2 page tree, 3 font, then a page and its content stream per page
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        ("<< /Type /Pages /Kids [" + " ".join(f"{4 + 2 * i} 0 R" for i in range(n_pages)) + f"] /Count {n_pages} >>").encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, page in enumerate(pages):
+        stream = "BT /F1 10 Tf 12 TL 50 780 Td " + " ".join(f"{pdf_string(line)} '" for line in page) + " ET"
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>".encode())
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream".encode())
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+def timed_run(named_files, parallel, max_workers=None):
+    start = time.perf_counter()
+    results = list(resume_processing.process_resumes(named_files, parallel=parallel, max_workers=max_workers))
+    seconds = time.perf_counter() - start
+    return {result["index"]: result["processed_text"] for result in results}, seconds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--synthetic", type=int, default=100, help="Generate this many synthetic PDF resumes")
+    parser.add_argument("--corpus", help="Directory of PDF resumes")
+    parser.add_argument("--workers", type=int, nargs="+", help="Worker counts to time (default: powers of two up to the core count)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.corpus:
+        named_files = []
+        for path in resume_processing.find_resume_files(args.corpus):
+            if path.lower().endswith(".pdf"):
+                with open(path, "rb") as f:
+                    named_files.append((path, f.read()))
+    else:
+        rng = np.random.default_rng(args.seed)
+        named_files = [
+            (f"resume_{i}.pdf", synthetic_pdf(text.split()))
+            for i, text in enumerate(synthetic_documents(args.synthetic, rng, n_words=(400, 1200)))
+        ]
+    cores = os.cpu_count() or 1
+    workers = args.workers or [2 ** i for i in range(cores.bit_length()) if 2 ** i <= cores]
+    print(f"{len(named_files)} PDF resumes ({sum(len(data) for _, data in named_files) / 1e6:.1f} MB), {cores} CPU core(s)")
+
+    # Loads NLTK, pdfplumber and the skill matcher in this process, as the serial path would after warm-up
+    try:
+        resume_processing.warm_up()
+    except LookupError as e:
+        print(f"{e} Preprocessing falls back to basic cleaning.")
+    expected, serial_s = timed_run(named_files, parallel=False)
+    rows = [("Serial", serial_s)]
+    mismatches = 0
+    for n_workers in workers:
+        resume_processing.warm_up_workers(n_workers)
+        texts, seconds = timed_run(named_files, parallel=True, max_workers=n_workers)
+        mismatches += texts != expected
+        rows.append((f"{n_workers} worker{'s' if n_workers > 1 else ''}", seconds))
+
+    print(f"{'Run':<14}{'Time (s)':>10}{'Resumes/s':>12}{'Speedup':>10}{'Per worker':>12}")
+    for (label, seconds), n_workers in zip(rows, [1] + workers):
+        speedup = serial_s / seconds
+        print(f"{label:<14}{seconds:>10.2f}{len(named_files) / seconds:>12.1f}{speedup:>9.2f}x{speedup / n_workers:>11.0%}")
+    print(f"{mismatches} of {len(workers)} parallel runs produced different text")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""
+Microbenchmark for resume text preprocessing throughput (tokens/sec).
+
+Usage:
+    python benchmarks/bench_preprocess.py --synthetic 300
+    python benchmarks/bench_preprocess.py --corpus path/to/resumes
+
+Compares the original per-call implementation, which rebuilt the stopword
+set and lemmatizer on every call, against the shared Preprocessor. The
+Preprocessor tokenizes each resume section on its own, so its output is
+checked against the original implementation run over the same sections;
+how many resumes differ from whole-text preprocessing is reported as well.
+Synthetic resumes are written under section headings, as real ones are.
+"""
+import os
+import re
+import sys
+import time
+import argparse
+
+import numpy as np
+from nltk.corpus import stopwords
+from nltk.tokenize import word_tokenize
+from nltk.stem import WordNetLemmatizer
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import resume_processing
+from compare_engines import SKILLS, FILLER
+
+
+def legacy_preprocess(raw_text):
+    """
+    Function reproducing preprocess_text as it was before the shared Preprocessor.
+    """
+    if not raw_text:
+        return ""
+    cleaned_text = re.sub(r"(page\s+\d+\s+of\s+\d+|page\s+\d+)", "", raw_text, flags=re.IGNORECASE)
+    cleaned_text = re.sub(r"(\n\s*continued\s*\n)", "", cleaned_text, flags=re.IGNORECASE)
+    cleaned_text = re.sub(r"\s{2,}", " ", cleaned_text).strip()
+    tokens = word_tokenize(cleaned_text.lower())
+    stop_words = set(stopwords.words("english"))
+    lemmatizer = WordNetLemmatizer()
+    filtered_tokens = [lemmatizer.lemmatize(w) for w in tokens if w.isalnum() and w not in stop_words]
+    return " ".join(filtered_tokens)
+
+
+def legacy_preprocess_sections(raw_text):
+    """
+    Function to run legacy_preprocess over each section and the text between them, as Preprocessor.analyze splits it.
+    """
+    chunks, position = [], 0
+    for _, start, end in resume_processing.find_sections(raw_text):
+        chunks += [raw_text[position:start], raw_text[start:end]]
+        position = end
+    chunks.append(raw_text[position:])
+    return " ".join(output for output in map(legacy_preprocess, chunks) if output)
+
+
+def synthetic_resumes(n_resumes, rng):
+    """
+    Function to generate raw resume-like text with section headings, punctuation, casing and page markers.
+    """
+    words = SKILLS + FILLER + "the and of in with for to a on at as by years experience skills".split()
+    headings = ["PROFESSIONAL SUMMARY", "Work Experience", "EDUCATION", "Skills:", "Certifications", "Projects"]
+    resumes = []
+    for _ in range(n_resumes):
+        lines = []
+        for page in range(1, rng.integers(1, 4) + 1):
+            for _ in range(rng.integers(20, 60)):
+                if rng.random() < 0.1:
+                    lines.append(str(rng.choice(headings)))
+                line = " ".join(rng.choice(words, size=rng.integers(4, 14)))
+                lines.append(line.capitalize() + rng.choice([".", ",", ";", ":", ""]))
+            lines.append(f"Page {page} of 3")
+        resumes.append("\n".join(lines))
+    return resumes
+
+
+def throughput(func, texts, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        outputs = [func(text) for text in texts]
+        best = min(best, time.perf_counter() - start)
+    n_tokens = sum(len(output.split()) for output in outputs)
+    return outputs, n_tokens / best, best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--synthetic", type=int, default=300, help="Generate this many synthetic resumes")
+    parser.add_argument("--corpus", help="Directory of resumes (.pdf or .txt)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.corpus:
+        texts = [resume_processing.read_resume_file(path) for path in resume_processing.find_resume_files(args.corpus)]
+    else:
+        texts = synthetic_resumes(args.synthetic, np.random.default_rng(args.seed))
+    print(f"{len(texts)} resumes, {sum(len(t) for t in texts) / 1e6:.1f} MB of text")
+
+    before, before_rate, before_time = throughput(legacy_preprocess, texts, args.repeat)
+    preprocessor = resume_processing.get_preprocessor()
+    after, after_rate, after_time = throughput(preprocessor, texts, args.repeat)
+
+    mismatches = sum(a != legacy_preprocess_sections(text) for text, a in zip(texts, after))
+    whole_text_differences = sum(a != b for a, b in zip(before, after))
+    info = preprocessor.lemmatize.cache_info()
+    print(f"{'Implementation':<28}{'Seconds':>10}{'Tokens/sec':>14}")
+    print(f"{'Per-call setup (before)':<28}{before_time:>10.2f}{before_rate:>14,.0f}")
+    print(f"{'Shared Preprocessor':<28}{after_time:>10.2f}{after_rate:>14,.0f}")
+    print(f"Speedup: {after_rate / before_rate:.2f}x, lemma memo hit rate {info.hits / max(1, info.hits + info.misses):.1%}")
+    print(f"Output mismatches: {mismatches} (differ from whole-text preprocessing: {whole_text_differences})")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
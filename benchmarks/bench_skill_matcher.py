@@ -0,0 +1,114 @@
+"""
+Skill dictionary matching: the compiled automaton against one search per skill.
+
+Usage:
+    python benchmarks/bench_skill_matcher.py --skills 20000 --synthetic 1000
+    python benchmarks/bench_skill_matcher.py --corpus path/to/resumes
+
+The bundled dictionary (data/skills.txt) is padded with synthetic one- to
+three-word skills up to --skills entries. Every resume is scanned with
+skill_matcher.SkillMatcher; a sample of them is also checked the naive way,
+one whole-word regex search per skill phrase, and the distinct skills found
+must agree. Compiling the automaton and loading the compiled copy from disk
+are timed as well. Exits with status 1 if the two methods disagree.
+"""
+import os
+import re
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import skill_matcher
+import resume_processing
+from compare_engines import synthetic_documents
+
+
+def synthetic_taxonomy(n_skills, rng):
+    """
+    Function to pad the bundled skills dictionary with synthetic multi-word skills.
+    """
+    with open(skill_matcher.DEFAULT_SKILLS_PATH, encoding="utf-8") as f:
+        skills = skill_matcher.parse_skills(f.read())
+    seen = {name.lower() for name, _ in skills}
+    while len(skills) < n_skills:
+        name = " ".join(f"term{i}" for i in rng.integers(0, 20000, size=rng.integers(1, 4)))
+        if name not in seen:
+            seen.add(name)
+            skills.append((name, []))
+    return skills
+
+
+def naive_skills(skills, text):
+    """
+    Function to find the distinct skills of a text with one whole-word search per skill phrase.
+    """
+    text = text.lower()
+    return {
+        name for name, aliases in skills
+        if any(re.search(r"(?<![\w+#])" + re.escape(phrase.lower()) + r"(?![\w+#])", text) for phrase in [name, *aliases])
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--skills", type=int, default=20000, help="Dictionary size after padding")
+    parser.add_argument("--synthetic", type=int, default=1000, help="Generate this many synthetic resumes")
+    parser.add_argument("--corpus", help="Directory of resumes (.pdf or .txt)")
+    parser.add_argument("--naive-sample", type=int, default=20, help="Resumes also scanned the naive way")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    skills = synthetic_taxonomy(args.skills, rng)
+    if args.corpus:
+        texts = [resume_processing.read_resume_file(path) for path in resume_processing.find_resume_files(args.corpus)]
+    else:
+        texts = synthetic_documents(args.synthetic, rng)
+
+    start = time.perf_counter()
+    matcher = skill_matcher.SkillMatcher.compile(skills)
+    compile_s = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "skills.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(" | ".join([name, *aliases]) for name, aliases in skills))
+        skill_matcher.load_matcher(path, cache_dir=tmp)
+        start = time.perf_counter()
+        skill_matcher.load_matcher(path, cache_dir=tmp)
+        load_s = time.perf_counter() - start
+
+    automaton_times = []
+    for text in texts:
+        start = time.perf_counter()
+        matcher.find(text)
+        automaton_times.append(time.perf_counter() - start)
+
+    naive_times, mismatches = [], 0
+    for text in texts[:args.naive_sample]:
+        start = time.perf_counter()
+        expected = naive_skills(skills, text)
+        naive_times.append(time.perf_counter() - start)
+        mismatches += set(matcher.skills(text)) != expected
+
+    automaton_ms = statistics.median(automaton_times) * 1000
+    naive_ms = statistics.median(naive_times) * 1000
+    print(f"{len(skills):,} skills ({len(matcher.goto):,} states), {len(texts):,} resumes")
+    print(f"Compile: {compile_s * 1000:.0f} ms, load compiled copy from disk: {load_s * 1000:.0f} ms")
+    print(f"{'Per resume':<16}{'Median (ms)':>14}")
+    print(f"{'Automaton':<16}{automaton_ms:>14.3f}")
+    print(f"{'Naive':<16}{naive_ms:>14.3f}")
+    print(f"Speedup: {naive_ms / automaton_ms:,.0f}x, all {len(texts):,} resumes scanned in {sum(automaton_times):.2f} s, "
+          f"{mismatches} of {len(naive_times)} sampled resumes disagree")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""
+Compare the TF-IDF and feature-hashing scoring engines for speed and ranking agreement.
+
+Usage:
+    python benchmarks/compare_engines.py --synthetic 20000
+    python benchmarks/compare_engines.py --corpus path/to/resumes --jobs path/to/job_descriptions
+
+Rankings are compared against the default TF-IDF engine (1,000 features) and
+against an uncapped TF-IDF vocabulary, which isolates the effect of hash
+collisions from the effect of the feature cap.
+"""
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+from scipy.stats import spearmanr
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scoring
+import resume_processing
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+SKILLS = (
+    "python java javascript typescript sql nosql react angular django flask spring docker kubernetes aws azure gcp "
+    "terraform linux git jenkins pandas numpy tensorflow pytorch spark hadoop kafka airflow tableau excel "
+    "communication leadership agile scrum testing security network marketing sales finance accounting "
+    "design figma photoshop recruiting operations logistics analytics statistics research writing"
+).split()
+FILLER = (
+    "managed developed team project experience worked built designed improved led delivered company client "
+    "system data service product process customer support year role responsible stakeholder quality"
+).split()
+
+
+def synthetic_documents(n_documents, rng, n_words=(80, 400)):
+    """
+    Function to generate resume-like preprocessed text from a skewed skill vocabulary.
+    """
+    vocabulary = np.array(SKILLS + FILLER + [f"term{i}" for i in range(20000)])
+    weights = 1.0 / np.arange(1, len(vocabulary) + 1) ** 0.9
+    weights /= weights.sum()
+    return [
+        " ".join(rng.choice(vocabulary, size=rng.integers(*n_words), p=weights))
+        for _ in range(n_documents)
+    ]
+
+
+def cosine_scores(matrix, n_jobs):
+    return cosine_similarity(matrix[:n_jobs], matrix[n_jobs:])
+
+
+def agreement(reference, candidate, top_n=20):
+    """
+    Function to report mean Spearman correlation and top-n overlap between score matrices.
+    """
+    correlations, overlaps = [], []
+    for ref_row, cand_row in zip(reference, candidate):
+        correlations.append(spearmanr(ref_row, cand_row).correlation)
+        ref_top = set(scoring.top_k_indices(ref_row, top_n).tolist())
+        cand_top = set(scoring.top_k_indices(cand_row, top_n).tolist())
+        overlaps.append(len(ref_top & cand_top) / top_n)
+    return float(np.mean(correlations)), float(np.mean(overlaps))
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--synthetic", type=int, default=0, help="Generate this many synthetic resumes")
+    parser.add_argument("--corpus", help="Directory of resumes (.pdf or .txt)")
+    parser.add_argument("--jobs", help="Directory of job descriptions (.txt)")
+    parser.add_argument("--n-jobs", type=int, default=10, help="Synthetic job descriptions to generate")
+    parser.add_argument("--top-n", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    if args.corpus:
+        resumes = scoring.load_corpus_texts(resume_processing.find_resume_files(args.corpus))
+        jobs = scoring.load_corpus_texts(resume_processing.find_resume_files(args.jobs)) if args.jobs else resumes[:args.n_jobs]
+    else:
+        resumes = synthetic_documents(args.synthetic or 20000, rng)
+        jobs = synthetic_documents(args.n_jobs, rng, n_words=(40, 120))
+    documents = jobs + resumes
+    print(f"{len(resumes)} resumes, {len(jobs)} job descriptions")
+
+    reference, tfidf_time = timed(scoring.make_vectorizer().fit_transform, documents)
+    uncapped, uncapped_time = timed(TfidfVectorizer(ngram_range=(1, 2)).fit_transform, documents)
+    reference_scores = cosine_scores(reference, len(jobs))
+    uncapped_scores = cosine_scores(uncapped, len(jobs))
+
+    rows = [("TF-IDF (1,000 features)", tfidf_time, 1.0, 1.0)]
+    correlation, overlap = agreement(reference_scores, uncapped_scores, args.top_n)
+    rows.append(("TF-IDF (uncapped)", uncapped_time, correlation, overlap))
+
+    for n_features in (2 ** 16, 2 ** 18, 2 ** 20):
+        engine = scoring.HashingEngine(n_features=n_features)
+        hashed, serial_time = timed(engine.fit_transform, documents)
+        _, parallel_time = timed(engine.fit_transform, documents, parallel=True)
+        hashed_scores = cosine_scores(hashed, len(jobs))
+        correlation, overlap = agreement(reference_scores, hashed_scores, args.top_n)
+        _, uncapped_overlap = agreement(uncapped_scores, hashed_scores, args.top_n)
+        label = f"Hashing 2^{n_features.bit_length() - 1}"
+        rows.append((label, serial_time, correlation, overlap))
+        rows.append((f"{label} (parallel)", parallel_time, correlation, overlap))
+        print(f"{label}: top-{args.top_n} overlap with uncapped TF-IDF {uncapped_overlap:.3f}")
+
+    print()
+    print(f"{'Engine':<30}{'Vectorize (s)':>15}{'Spearman':>12}{f'Top-{args.top_n} overlap':>18}")
+    for label, seconds, correlation, overlap in rows:
+        print(f"{label:<30}{seconds:>15.2f}{correlation:>12.3f}{overlap:>18.3f}")
+
+
+if __name__ == "__main__":
+    main()
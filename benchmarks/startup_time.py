@@ -0,0 +1,183 @@
+"""
+Cold-start report for the Streamlit pages: import cost, first paint and rerun time.
+
+Usage:
+    python benchmarks/startup_time.py
+    python benchmarks/startup_time.py --output benchmarks/startup_report.md
+
+Each page runs in a fresh interpreter under `python -X importtime` and
+Streamlit's AppTest. Streamlit and the test harness are loaded and warmed up
+on a page-less script first, so the numbers cover only what the page itself
+costs: the modules it imports on its first run, the time from script start
+to the first element sent to the browser (first paint), the whole first run,
+and the median of later reruns. Pages run through a small wrapper script
+that records when the page starts, and times end at the last element the
+page sends, so the harness's own session setup is not counted.
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+import tempfile
+import time
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES = ["Home.py", "pages/_About.py", "pages/_Contact.py", "pages/_Resume_Screener.py"]
+MARKER = "startup_time: page starts here"
+BUDGET_MS = 200
+
+# Exercises Streamlit's own first-call costs (markdown, layout, emoji tables) so they are not charged to a page
+WARM_UP_SCRIPT = """
+import streamlit as st
+st.set_page_config(page_icon="🚀")
+st.markdown("## :rocket: warm-up", unsafe_allow_html=True)
+col1, col2 = st.columns(2)
+col1.metric("metric", 1, "1")
+with st.expander("expander"):
+    tab1, tab2 = st.tabs(["one", "two"])
+    tab1.write("text")
+st.sidebar.radio("radio", ["a", "b"])
+st.text_area("text")
+st.button("button")
+"""
+
+# Runs the page as Streamlit would, after noting when it started
+PAGE_SCRIPT = """
+import time, runpy, _startup_clock
+_startup_clock.starts.append(time.perf_counter())
+runpy.run_path({path!r}, run_name="__main__")
+"""
+
+
+def run_page(page, reruns):
+    """
+    Function to time one page inside the current (fresh) interpreter.
+    """
+    sys.path.insert(0, ROOT)
+    from streamlit.testing.v1 import AppTest
+    from streamlit.runtime.scriptrunner_utils.script_run_context import ScriptRunContext
+
+    # Timestamp every message the script sends, and the start of every run of the page
+    messages = []
+    clock = sys.modules["_startup_clock"] = types.ModuleType("_startup_clock")
+    clock.starts = []
+    enqueue = ScriptRunContext.enqueue
+
+    def timed_enqueue(self, msg):
+        messages.append((time.perf_counter(), msg.WhichOneof("type")))
+        return enqueue(self, msg)
+
+    ScriptRunContext.enqueue = timed_enqueue
+
+    with tempfile.TemporaryDirectory() as tmp:
+        warm_up_path = os.path.join(tmp, "warm_up.py")
+        page_path = os.path.join(tmp, "page.py")
+        with open(warm_up_path, "w", encoding="utf-8") as f:
+            f.write(WARM_UP_SCRIPT)
+        with open(page_path, "w", encoding="utf-8") as f:
+            f.write(PAGE_SCRIPT.format(path=os.path.join(ROOT, page)))
+        AppTest.from_file(warm_up_path, default_timeout=120).run()
+
+        print(MARKER, file=sys.stderr, flush=True)
+        app = AppTest.from_file(page_path, default_timeout=120)
+        runs = []
+        for _ in range(reruns + 1):
+            messages.clear()
+            app.run()
+            start = clock.starts[-1]
+            deltas = [t for t, kind in messages if kind == "delta"]
+            runs.append(((deltas[0] - start) * 1000, (deltas[-1] - start) * 1000))
+    return {
+        "first_paint_ms": runs[0][0],
+        "first_run_ms": runs[0][1],
+        "rerun_ms": statistics.median(run for _, run in runs[1:]),
+        "exceptions": len(app.exception),
+    }
+
+
+def parse_importtime(stderr):
+    """
+    Function to summarize -X importtime output after the marker into top-level modules and their cumulative cost.
+    """
+    lines = stderr.splitlines()
+    if MARKER in lines:
+        lines = lines[lines.index(MARKER) + 1:]
+    modules = []
+    for line in lines:
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if not cumulative.strip().isdigit():
+            continue
+        # Top-level imports are indented by exactly one space; runpy belongs to the wrapper
+        if name.startswith(" ") and not name.startswith("  ") and name.strip() != "runpy":
+            modules.append((name.strip(), int(cumulative) / 1000))
+    return modules
+
+
+def measure(page, reruns):
+    """
+    Function to run one page in a fresh interpreter and collect its timings and imports.
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", os.path.abspath(__file__), "--child", page, "--reruns", str(reruns)],
+        capture_output=True, text=True, cwd=ROOT,
+    )
+    if process.returncode != 0:
+        raise RuntimeError(f"{page} failed:\n{process.stderr[-2000:]}")
+    result = json.loads(process.stdout.strip().splitlines()[-1])
+    result["imports"] = parse_importtime(process.stderr)
+    return result
+
+
+def report(results, top_n):
+    lines = [
+        "# Startup time report",
+        "",
+        f"Generated by `python benchmarks/startup_time.py` with Python {sys.version.split()[0]}.",
+        "All times are measured from script start in a fresh server process. First paint is the first",
+        "element sent to the browser; first run is the whole cold run; rerun is the median of later reruns.",
+        f"Budget: {BUDGET_MS} ms of first paint and rerun time for the landing and about pages.",
+        "",
+        "| Page | Imports on first run (ms) | First paint (ms) | First run (ms) | Rerun (ms) |",
+        "| --- | ---: | ---: | ---: | ---: |",
+    ]
+    for page, result in results.items():
+        import_ms = sum(ms for _, ms in result["imports"])
+        lines.append(
+            f"| `{page}` | {import_ms:,.0f} | {result['first_paint_ms']:,.0f} "
+            f"| {result['first_run_ms']:,.0f} | {result['rerun_ms']:,.0f} |"
+        )
+    for page, result in results.items():
+        lines += ["", f"## `{page}`: slowest imports", ""]
+        slowest = sorted(result["imports"], key=lambda item: -item[1])[:top_n]
+        lines += [f"- `{name}`: {ms:,.1f} ms" for name, ms in slowest] or ["- none beyond Streamlit itself"]
+    return "\n".join(lines) + "\n"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", help="Write the Markdown report to this file as well")
+    parser.add_argument("--reruns", type=int, default=5)
+    parser.add_argument("--top-n", type=int, default=8, help="Slowest imports to list per page")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(run_page(args.child, args.reruns)))
+        return 0
+
+    results = {page: measure(page, args.reruns) for page in PAGES}
+    text = report(results, args.top_n)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""
+Parity and throughput check of the fast regex tokenizer against NLTK's word_tokenize.
+
+Usage:
+    python benchmarks/tokenizer_parity.py
+    python benchmarks/tokenizer_parity.py --corpus path/to/resumes --synthetic 300
+
+Every document is cleaned and lowercased as preprocessing does, tokenized
+both ways and filtered to isalnum() tokens; any document whose filtered token
+streams differ is reported with the first divergence. The built-in corpus
+(benchmarks/data/tokenizer_parity.txt, documents separated by "---" lines)
+collects the punctuation, abbreviation and contraction cases resumes contain.
+Exits with status 1 on any divergence.
+"""
+import os
+import sys
+import time
+import argparse
+import difflib
+
+import numpy as np
+from nltk.tokenize import word_tokenize
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import resume_processing
+from bench_preprocess import synthetic_resumes
+
+PARITY_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "tokenizer_parity.txt")
+
+
+def load_parity_corpus(path=PARITY_CORPUS):
+    """
+    Function to read the parity corpus as a list of documents.
+    """
+    with open(path, encoding="utf-8") as f:
+        documents, lines = [], []
+        for line in f:
+            if line.strip() == "---":
+                documents.append("".join(lines))
+                lines = []
+            else:
+                lines.append(line)
+    if "".join(lines).strip():
+        documents.append("".join(lines))
+    return documents
+
+
+def filtered_tokens(tokenize, text):
+    return [w for w in tokenize(text) if w.isalnum()]
+
+
+def first_divergence(expected, actual, context=4):
+    """
+    Function to describe where two token streams first differ.
+    """
+    matcher = difflib.SequenceMatcher(a=expected, b=actual, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag != "equal":
+            before = " ".join(expected[max(0, i1 - context):i1])
+            return f"...{before} [nltk: {' '.join(expected[i1:i2]) or '-'} | fast: {' '.join(actual[j1:j2]) or '-'}]"
+    return ""
+
+
+def throughput(tokenize, texts, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        n_tokens = sum(len(filtered_tokens(tokenize, text)) for text in texts)
+        best = min(best, time.perf_counter() - start)
+    return n_tokens / best, best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--corpus", help="Directory of resumes (.pdf or .txt) to check as well")
+    parser.add_argument("--synthetic", type=int, default=0, help="Also generate this many synthetic resumes")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    named_texts = [(f"parity corpus #{i + 1}", text) for i, text in enumerate(load_parity_corpus())]
+    if args.corpus:
+        for path in resume_processing.find_resume_files(args.corpus):
+            named_texts.append((path, resume_processing.read_resume_file(path)))
+    if args.synthetic:
+        rng = np.random.default_rng(args.seed)
+        named_texts += [(f"synthetic #{i + 1}", text) for i, text in enumerate(synthetic_resumes(args.synthetic, rng))]
+
+    cleaner = resume_processing.get_preprocessor()
+    texts = [cleaner.clean(text).lower() for _, text in named_texts]
+    fast = resume_processing.FastTokenizer().tokenize
+
+    divergent = 0
+    for (name, _), text in zip(named_texts, texts):
+        expected, actual = filtered_tokens(word_tokenize, text), filtered_tokens(fast, text)
+        if expected != actual:
+            divergent += 1
+            print(f"DIVERGENT {name}: {first_divergence(expected, actual)}")
+
+    nltk_rate, nltk_time = throughput(word_tokenize, texts, args.repeat)
+    fast_rate, fast_time = throughput(fast, texts, args.repeat)
+    print(f"{len(texts)} documents, {sum(len(t) for t in texts) / 1e6:.2f} MB of text")
+    print(f"{'Tokenizer':<16}{'Seconds':>10}{'Tokens/sec':>14}")
+    print(f"{'word_tokenize':<16}{nltk_time:>10.3f}{nltk_rate:>14,.0f}")
+    print(f"{'FastTokenizer':<16}{fast_time:>10.3f}{fast_rate:>14,.0f}")
+    print(f"Speedup: {fast_rate / nltk_rate:.1f}x, divergent documents: {divergent}")
+    return 1 if divergent else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
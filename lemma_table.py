@@ -0,0 +1,122 @@
+import os
+import sys
+import time
+import sqlite3
+import argparse
+import threading
+import multiprocessing.util
+
+from text_cache import DEFAULT_CACHE_DIR
+
+DEFAULT_LEMMA_TABLE_PATH = os.environ.get("RESUME_LEMMA_TABLE", os.path.join(DEFAULT_CACHE_DIR, "lemmas.sqlite3"))
+
+# New lemmas are written in batches; a batch is flushed once it reaches this size
+# or has waited this many seconds, at the end of a run and when the process exits
+FLUSH_SIZE = 1000
+FLUSH_INTERVAL = 30
+
+
+class LemmaTable:
+    """
+    On-disk token -> lemma table shared by every process and session.
+
+    The table is an SQLite file read into a dict when opened, so lookups
+    are plain dict hits; tokens missing from the snapshot are looked up on
+    disk (another process may have added them) before WordNet is asked.
+    New lemmas are buffered and written in one transaction per flush().
+    The table is cleared when it was built with a different version, which
+    names both the NLTK release and the WordNet data.
+    """
+
+    def __init__(self, path=DEFAULT_LEMMA_TABLE_PATH, version=""):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.version = version
+        self.pending = {}
+        self.pending_since = None
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS lemmas (token TEXT PRIMARY KEY, lemma TEXT NOT NULL) WITHOUT ROWID")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if row is None or row[0] != version:
+            self._conn.execute("DELETE FROM lemmas")
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)", (version,))
+        self._conn.commit()
+        self.lemmas = dict(self._conn.execute("SELECT token, lemma FROM lemmas"))
+        # Runs at exit in pool workers too, which skip atexit handlers
+        multiprocessing.util.Finalize(self, self.flush, exitpriority=10)
+
+    def __len__(self):
+        return len(self.lemmas)
+
+    def lookup(self, token):
+        """
+        Function to get the stored lemma of a token, or None if no process has lemmatized it yet.
+        """
+        lemma = self.lemmas.get(token)
+        if lemma is None:
+            with self._lock:
+                try:
+                    row = self._conn.execute("SELECT lemma FROM lemmas WHERE token = ?", (token,)).fetchone()
+                except sqlite3.Error:
+                    row = None
+            if row is not None:
+                lemma = self.lemmas[token] = row[0]
+        return lemma
+
+    def add(self, token, lemma):
+        """
+        Function to record a newly computed lemma, written to disk on the next flush.
+        """
+        with self._lock:
+            if not self.pending:
+                self.pending_since = time.monotonic()
+            self.lemmas[token] = lemma
+            self.pending[token] = lemma
+            due = len(self.pending) >= FLUSH_SIZE or time.monotonic() - self.pending_since >= FLUSH_INTERVAL
+        if due:
+            self.flush()
+
+    def flush(self):
+        """
+        Function to write buffered lemmas to disk in one transaction.
+        """
+        with self._lock:
+            if not self.pending:
+                return
+            rows, self.pending = list(self.pending.items()), {}
+            try:
+                self._conn.executemany("INSERT OR IGNORE INTO lemmas (token, lemma) VALUES (?, ?)", rows)
+                self._conn.commit()
+            except sqlite3.Error:
+                # Read-only or locked table: keep working from memory
+                self._conn.rollback()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prebuild the shared lemma table from a historical corpus.")
+    parser.add_argument("corpus", help="Directory of historical resumes (.pdf or .txt)")
+    parser.add_argument("--tokenizer", choices=["nltk", "fast"], help="Tokenizer to preprocess with")
+    args = parser.parse_args(argv)
+
+    # Imported here because resume_processing itself opens the lemma table
+    import resume_processing
+
+    preprocessor = resume_processing.get_preprocessor(args.tokenizer)
+    table = preprocessor.lemma_table
+    if table is None:
+        parser.error(f"Could not open the lemma table at {DEFAULT_LEMMA_TABLE_PATH}")
+    before = len(table)
+    for path in resume_processing.find_resume_files(args.corpus):
+        try:
+            preprocessor.analyze(resume_processing.read_resume_file(path))
+        except Exception as e:
+            print(f"Skipping {path}: {e}", file=sys.stderr)
+    table.flush()
+    print(f"Lemma table has {len(table):,} tokens ({len(table) - before:,} new) -> {table.path}")
+
+
+if __name__ == "__main__":
+    main()
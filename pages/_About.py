@@ -1,7 +1,5 @@
 import streamlit as st
 import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
 
 def about_page():
     """
@@ -189,13 +187,12 @@ def about_page():
     
     with col2:
         # Create a simple pie chart showing time allocation
-        fig = px.pie(
+        fig = go.Figure(go.Pie(
             values=[70, 15, 10, 5], 
-            names=['Manual Review', 'Candidate Calls', 'Documentation', 'Decision Making'],
-            title="Traditional Recruitment Time Allocation",
-            color_discrete_sequence=['#ff7675', '#74b9ff', '#00b894', '#fdcb6e']
-        )
-        fig.update_layout(height=300, showlegend=True, title_font_size=12)
+            labels=['Manual Review', 'Candidate Calls', 'Documentation', 'Decision Making'],
+            marker=dict(colors=['#ff7675', '#74b9ff', '#00b894', '#fdcb6e'])
+        ))
+        fig.update_layout(title="Traditional Recruitment Time Allocation", height=300, showlegend=True, title_font_size=12)
         st.plotly_chart(fig, use_container_width=True)
 
     # Solution section
@@ -285,17 +282,18 @@ def about_page():
             """)
             
             # Create a sample TF-IDF visualization
-            import pandas as pd
-            sample_data = pd.DataFrame({
+            sample_data = {
                 'Term': ['Python', 'JavaScript', 'Machine Learning', 'Database', 'Communication'],
                 'TF Score': [0.15, 0.08, 0.12, 0.06, 0.04],
                 'IDF Score': [2.1, 1.8, 2.5, 1.6, 1.2],
                 'TF-IDF': [0.32, 0.14, 0.30, 0.10, 0.05]
-            })
+            }
             
-            fig = px.bar(sample_data, x='Term', y='TF-IDF', title='Sample TF-IDF Scores',
-                        color='TF-IDF', color_continuous_scale='Blues')
-            fig.update_layout(height=350)
+            fig = go.Figure(go.Bar(
+                x=sample_data['Term'], y=sample_data['TF-IDF'],
+                marker=dict(color=sample_data['TF-IDF'], colorscale='Blues', showscale=True, colorbar=dict(title='TF-IDF'))
+            ))
+            fig.update_layout(title='Sample TF-IDF Scores', xaxis_title='Term', yaxis_title='TF-IDF', height=350)
             st.plotly_chart(fig, use_container_width=True)
         
         with tab2:
@@ -310,17 +308,25 @@ def about_page():
             """)
             
             # Cosine similarity visualization
-            similarity_data = pd.DataFrame({
+            similarity_data = {
                 'Resume': ['Resume A', 'Resume B', 'Resume C', 'Resume D', 'Resume E'],
                 'Similarity Score': [0.85, 0.72, 0.58, 0.41, 0.29],
                 'Category': ['Excellent', 'Good', 'Fair', 'Poor', 'Poor']
-            })
+            }
+            category_colors = {'Excellent': '#00b894', 'Good': '#fdcb6e', 'Fair': '#e17055', 'Poor': '#d63031'}
             
-            fig = px.scatter(similarity_data, x='Resume', y='Similarity Score', 
-                           color='Category', size='Similarity Score',
-                           title='Sample Similarity Scores',
-                           color_discrete_map={'Excellent': '#00b894', 'Good': '#fdcb6e', 'Fair': '#e17055', 'Poor': '#d63031'})
-            fig.update_layout(height=350)
+            fig = go.Figure()
+            for category, color in category_colors.items():
+                points = [i for i, c in enumerate(similarity_data['Category']) if c == category]
+                fig.add_trace(go.Scatter(
+                    x=[similarity_data['Resume'][i] for i in points],
+                    y=[similarity_data['Similarity Score'][i] for i in points],
+                    mode='markers', name=category,
+                    marker=dict(color=color, size=[similarity_data['Similarity Score'][i] for i in points],
+                                sizemode='area', sizeref=2 * max(similarity_data['Similarity Score']) / 20 ** 2)
+                ))
+            fig.update_layout(title='Sample Similarity Scores', xaxis_title='Resume', yaxis_title='Similarity Score',
+                              legend_title='Category', height=350)
             st.plotly_chart(fig, use_container_width=True)
         
         with tab3:
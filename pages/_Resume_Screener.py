@@ -1,18 +1,19 @@
 import os
 import re
-import pdfplumber
-import nltk
+import html
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
+import numpy as np
+import scipy.sparse as sp
 import plotly.graph_objects as go
-import plotly.express as px
-import random
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-from nltk.stem import WordNetLemmatizer
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+# pandas, nltk, pdfplumber, plotly.express and scikit-learn are imported where
+# they are first needed, so the page paints before they load
+import resume_processing
+import text_cache
+import query_cache
+import scoring
+import skill_matcher
+import talent_pool
+import warmup
 
 # Configure Streamlit page
 st.set_page_config(
@@ -174,6 +175,11 @@ st.markdown("""
         box-shadow: 0 2px 8px rgba(116, 185, 255, 0.3);
     }
     
+    .skill-badge {
+        background: linear-gradient(135deg, #a29bfe 0%, #6c5ce7 100%);
+        box-shadow: 0 2px 8px rgba(162, 155, 254, 0.3);
+    }
+    
     /* Match level badges */
     .match-excellent { background: linear-gradient(135deg, #00b894 0%, #00cec9 100%); }
     .match-good { background: linear-gradient(135deg, #fdcb6e 0%, #e17055 100%); }
@@ -245,91 +251,244 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# NOTE: Ensure NLTK data is available by running the download script once.
-# import nltk
-# nltk.download('all')
+# Batches larger than this are hashed across worker processes
+HASHING_PARALLEL_THRESHOLD = 2000
 
-# Function to extract text from PDF
-def extract_text_from_pdf(file_buffer):
-    try:
-        text = ""
-        with pdfplumber.open(file_buffer) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-        return text.strip()
-    except Exception as e:
-        st.error(f"Error extracting text from PDF: {str(e)}")
-        return ""
+# Number of ranked candidates shown per results page, by default and as offered in the page-size selector
+RESULTS_PAGE_SIZE = 20
+RESULTS_PAGE_SIZES = (10, 20, 50, 100)
 
-# Function to preprocess text
-def preprocess_text(raw_text):
-    if not raw_text:
-        return ""
-    
-    try:
-        # Clean the text
-        cleaned_text = re.sub(r"(page\s+\d+\s+of\s+\d+|page\s+\d+)", "", raw_text, flags=re.IGNORECASE)
-        cleaned_text = re.sub(r"(\n\s*continued\s*\n)", "", cleaned_text, flags=re.IGNORECASE)
-        cleaned_text = re.sub(r"\s{2,}", " ", cleaned_text).strip()
+# Matched keywords kept per candidate, strongest TF-IDF contribution first
+MATCHED_KEYWORDS = 15
 
-        # Tokenize
-        tokens = word_tokenize(cleaned_text.lower())
-        
-        # Remove stopwords and lemmatize
-        stop_words = set(stopwords.words("english"))
-        lemmatizer = WordNetLemmatizer()
-        filtered_tokens = [lemmatizer.lemmatize(w) for w in tokens if w.isalnum() and w not in stop_words]
-        
-        return " ".join(filtered_tokens)
-    except Exception as e:
-        st.error(f"Error preprocessing text: {str(e)}")
-        # Fallback: basic cleaning without NLTK
-        cleaned_text = re.sub(r"[^a-zA-Z\s]", "", raw_text.lower())
-        return " ".join(cleaned_text.split())
-
-# Function to extract "Skills" section from text
-def extract_skills_section(text):
-    if not text:
-        return ""
-    
-    skills_pattern = re.compile(r"(skills|technical skills|core competencies|expertise):(.+?)(\n\n|\n[A-Z]|\Z)", re.IGNORECASE | re.DOTALL)
-    match = skills_pattern.search(text)
-    if match:
-        skills_text = match.group(2).strip()
-        return preprocess_text(skills_text)
-    return ""
-
-# Function to calculate cosine similarity
-def calculate_cosine_similarity(job_description, resumes):
-    if not job_description or not resumes:
-        return [], None
-    
-    try:
-        documents = [job_description] + resumes
-        vectorizer = TfidfVectorizer(max_features=1000, ngram_range=(1, 2))
+# Matched skills and keywords shown as badges on each ranking card
+CARD_SKILLS = 6
+CARD_KEYWORDS = 5
+
+# Fields scored against the job description: the whole resume, then each section the segmenter finds
+FIELDS = ("document",) + resume_processing.SECTIONS
+FIELD_LABELS = {
+    "document": "Whole resume",
+    "summary": "Summary",
+    "experience": "Experience",
+    "education": "Education",
+    "skills": "Skills section",
+    "certifications": "Certifications",
+}
+# Whole-resume cosine similarity alone, as scored before field weights existed
+DEFAULT_FIELD_WEIGHTS = (("document", 1.0),) + tuple((field, 0.0) for field in resume_processing.SECTIONS)
+
+# NOTE: NLTK data is checked and loaded in the background when the app starts;
+# run `python warmup.py` to check a deployment from the command line.
+
+# Function to get the persistent extracted-text cache shared by all sessions
+@st.cache_resource
+def get_text_cache():
+    return text_cache.TextCache(version=resume_processing.EXTRACTOR_VERSION)
+
+# Function to get the LRU cache of analyzed and vectorized job descriptions shared by all sessions
+@st.cache_resource
+def get_query_cache():
+    return query_cache.QueryCache()
+
+# Function to get the hot-swappable pre-fitted corpus model shared by all sessions
+@st.cache_resource
+def get_model_store():
+    return scoring.ModelStore()
+
+# Function to get the feature-hashing scoring engine for a feature count
+@st.cache_resource
+def get_hashing_engine(n_features):
+    return scoring.HashingEngine(n_features=n_features)
+
+# Function to get the persisted talent pool shared by all sessions
+@st.cache_resource
+def get_pool_store():
+    return talent_pool.PoolStore()
+
+# Function to start loading NLTK data, the scoring engine and the corpus model once per server process
+@st.cache_resource
+def get_warmup():
+    return warmup.Warmup(warmup.default_tasks(get_model_store())).start()
+
+# Function to wait for the background warm-up before work that needs its resources
+def wait_for_warmup(state):
+    if not state.done:
+        with st.spinner("⏳ Finishing loading language models..."):
+            state.wait()
+    for name, error in state.errors.items():
+        st.markdown(f"""
+        <div class="custom-alert-warning">
+            ⚠️ {name} failed to load: {error}
+        </div>
+        """, unsafe_allow_html=True)
+
+# Function to analyze and vectorize job descriptions through the shared JD cache
+def analyze_job_descriptions(job_descriptions, model_key=None, vectorize=None):
+    cache = get_query_cache()
+    tokenizer = st.session_state.get("tokenizer")
+    analyses, vectors = [], []
+    for job_description in job_descriptions:
+        key = cache.make_key(job_description, tokenizer, model_key)
+        entry = cache.get(key)
+        if entry is None:
+            try:
+                analysis = resume_processing.analyze(job_description, tokenizer)
+                cacheable = True
+            except Exception as e:
+                st.error(f"Error preprocessing text: {str(e)}")
+                # Fallback results are not cached, so the next run tries NLTK again
+                analysis = resume_processing.basic_analysis(job_description)
+                cacheable = False
+            entry = (analysis, vectorize(analysis["tokens"]) if vectorize else None)
+            if cacheable:
+                cache.put(key, *entry)
+        analyses.append(entry[0])
+        vectors.append(entry[1])
+    return analyses, vectors
+
+# Function to show the shared JD cache's hit rate
+def display_query_cache_stats():
+    stats = get_query_cache().stats()
+    st.caption(
+        f"🧾 JD cache: {stats['hits']} hits / {stats['misses']} misses "
+        f"({stats['hit_rate'] * 100:.0f}% hit rate, {stats['entries']} cached job descriptions)"
+    )
+
+# Function to get this session's cache of resume (or section) vectors for a scoring setting
+def get_vector_cache(key, slot="vector_cache"):
+    cache = st.session_state.get(slot)
+    if cache is None or cache.key != key:
+        cache = st.session_state[slot] = scoring.VectorCache(key)
+    return cache
+
+# Function to vectorize job descriptions and resumes into one matrix, job descriptions first
+def vectorize_documents(job_descriptions, resumes, vectorizer=None, vector_cache=None, resume_keys=None, job_vectors=None):
+    documents = job_descriptions + resumes
+    if vectorizer is None:
+        vectorizer = scoring.make_vectorizer()
         tfidf_matrix = vectorizer.fit_transform(documents)
-        cosine_sim_scores = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:]).flatten()
+    elif isinstance(vectorizer, scoring.HashingEngine):
+        # Stateless hashing: IDF comes from this batch's merged document frequencies
+        if vector_cache is None:
+            tfidf_matrix = vectorizer.fit_transform(documents, parallel=len(documents) > HASHING_PARALLEL_THRESHOLD)
+        else:
+            # Only new resumes are hashed; cached counts still feed the batch's document frequencies
+            if job_vectors is None:
+                job_counts, document_frequency = vectorizer.count(job_descriptions)
+            else:
+                job_counts = sp.vstack(job_vectors, format="csr")
+                document_frequency = scoring.DocumentFrequency(vectorizer.n_features).update(job_counts)
+            resume_counts = vector_cache.matrix(
+                resume_keys, resumes,
+                lambda docs: vectorizer.count_batch(docs, parallel=len(docs) > HASHING_PARALLEL_THRESHOLD)[0]
+            )
+            document_frequency.update(resume_counts)
+            tfidf_matrix = vectorizer.weight(sp.vstack([job_counts, resume_counts], format="csr"), document_frequency)
+    else:
+        # Pre-fitted corpus model: scores no longer depend on the rest of the batch
+        if vector_cache is None:
+            tfidf_matrix = vectorizer.transform(documents)
+        else:
+            resume_matrix = vector_cache.matrix(resume_keys, resumes, vectorizer.transform)
+            tfidf_matrix = sp.vstack([vectorizer.transform(job_descriptions), resume_matrix], format="csr")
+    return tfidf_matrix, vectorizer
+
+# Function to split the job description box into one description per role
+def split_job_descriptions(text):
+    job_descriptions = [jd.strip() for jd in re.split(r"^\s*---+\s*$", text, flags=re.MULTILINE)]
+    return [jd for jd in job_descriptions if jd]
 
-        return sorted(zip(range(len(resumes)), cosine_sim_scores), key=lambda x: x[1], reverse=True), vectorizer
+# Function to name a role after the first line of its job description
+def get_role_title(job_description, number):
+    first_line = job_description.strip().splitlines()[0].strip()
+    return f"{number}. {first_line[:40] + '...' if len(first_line) > 40 else first_line}"
+
+# Function to get a scored candidate's matched keywords, strongest contribution to the score first
+def get_matched_keywords(run, index, role=0, top_n=MATCHED_KEYWORDS):
+    indptr, columns, _ = run["keywords"][role]
+    names = run["keyword_names"][role]
+    # Field-weighted keywords come from block columns, where a term repeats once per field
+    n_features = run["fields"].n_features
+    matched = dict.fromkeys(names[column % n_features] for column in columns[indptr[index]:indptr[index + 1]])
+    return list(matched)[:top_n]
+
+# Function to get the job description's dictionary skills a candidate's resume mentions, in job description order
+def get_matched_skills(run, index, role=0):
+    resume_skills = run["resume_skills"][index]
+    return [skill for skill in run["job_skills"][role] if skill in resume_skills]
+
+# Function to let the user require job description skills, returning the candidates that mention them all (None for everyone)
+def filter_by_required_skills(run, role=0, key="required_skills"):
+    options = run["job_skills"][role]
+    if not options:
+        return None
+    required = st.multiselect(
+        "🧩 Required skills",
+        options,
+        key=key,
+        help="Only rank candidates whose resume mentions every selected skill. Skills come from the skills dictionary (data/skills.txt)."
+    )
+    if not required:
+        return None
+    return np.array([i for i, skills in enumerate(run["resume_skills"]) if skills.issuperset(required)], dtype=np.int64)
+
+# Function to add or update processed uploads in the talent pool, keyed by content hash
+def add_resumes_to_pool(pool, model, resumes_data):
+    try:
+        candidates = [{"id": f"sha256:{r['sha256']}", "name": r["name"]} for r in resumes_data]
+        matrix = model["vectorizer"].transform([r["analysis"]["tokens"] for r in resumes_data])
+        pool.add(candidates, matrix, model["version"])
+        st.caption(f"🗂️ Added {len(candidates)} resume(s) to the talent pool ({len(pool):,} candidates)")
+        return True
     except Exception as e:
-        st.error(f"Error calculating similarity: {str(e)}")
-        return [], None
+        st.error(f"Error adding resumes to the talent pool: {str(e)}")
+        return False
 
-# Function to get matched keywords
-def get_matched_keywords(job_desc, resume_text, top_n=15):
-    if not job_desc or not resume_text:
-        return []
-    
-    job_words = set(preprocess_text(job_desc).split())
-    resume_words = set(preprocess_text(resume_text).split())
-    
-    matched = list(job_words.intersection(resume_words))
-    
-    matched = [word for word in matched if len(word) > 2]
-    
-    return matched[:top_n]
+# Function to map a similarity score to its match level
+def get_match_level(score):
+    return "Excellent" if score > 0.3 else "Good" if score > 0.15 else "Fair" if score > 0.05 else "Poor"
+
+# Function to score a job description against the whole stored talent pool
+def display_talent_pool_results(job_description, pool, model, top_n, engine="scan"):
+    if model is None or model["version"] != pool.model_version:
+        st.markdown("""
+        <div class="custom-alert-warning">
+            ⚠️ The talent pool was built with a different corpus model. Rebuild it with <code>python talent_pool.py build &lt;corpus_dir&gt;</code>.
+        </div>
+        """, unsafe_allow_html=True)
+        return
+
+    from sklearn.preprocessing import normalize
+
+    # Shares JD cache entries with uploaded-resume screening on the same model
+    _, vectors = analyze_job_descriptions(
+        [job_description],
+        ("corpus", model["version"], st.session_state.get("tokenizer")),
+        lambda tokens: scoring.query_weights(model["vectorizer"], [tokens])
+    )
+    query_vector = normalize(vectors[0])
+    results = pool.search(query_vector, top_n=top_n, engine=engine)
+
+    rankings_df = build_rankings_df(
+        [candidate["name"] for candidate, _ in results], range(len(results)), [score for _, score in results]
+    )
+
+    st.markdown(f"""
+    <div class="results-section">
+        <div class="section-header">
+            <span class="section-icon">🗂️</span>
+            <h3>Talent Pool Matches (top {len(results)} of {len(pool):,})</h3>
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+
+    if results:
+        display_ranking_cards(rankings_df)
+        with st.expander("📊 View detailed ranking table"):
+            st.dataframe(rankings_df, use_container_width=True, hide_index=True)
+    else:
+        st.info("ℹ️ The talent pool is empty.")
 
 # Function to create modern visualizations
 def create_similarity_chart(rankings_df):
@@ -378,28 +537,517 @@ def create_similarity_chart(rankings_df):
     
     return fig
 
-# Function to create ranking cards
+# Function to build the rankings table for a slice of ranked resumes
+def build_rankings_df(names, indices, scores, first_rank=1, keywords=None, skills=None):
+    import pandas as pd
+    rows = [{
+        "Rank": rank,
+        "Resume": names[index],
+        "Similarity Score (%)": f"{score * 100:.2f}%",
+        "Match Level": get_match_level(score)
+    } for rank, (index, score) in enumerate(zip(indices, scores), start=first_rank)]
+    if skills is not None:
+        for row, index in zip(rows, indices):
+            row["Matched Skills"] = ", ".join(skills(index))
+    if keywords is not None:
+        for row, index in zip(rows, indices):
+            row["Matched Keywords"] = ", ".join(keywords(index))
+    return pd.DataFrame(rows)
+
+# Function to render a page of ranking cards as one HTML payload, so the browser gets one element however long the page
 def display_ranking_cards(rankings_df):
-    for idx, row in rankings_df.iterrows():
+    cards = []
+    for row in rankings_df.to_dict("records"):
         match_class = f"match-{row['Match Level'].lower()}"
-        
-        st.markdown(f"""
-        <div class="ranking-card">
-            <div style="display: flex; align-items: center; justify-content: space-between;">
-                <div style="display: flex; align-items: center;">
-                    <span class="rank-badge">{row['Rank']}</span>
-                    <div>
-                        <h4 style="margin: 0; color: #2d3436; font-size: 1.1rem;">{row['Resume']}</h4>
-                        <p style="margin: 0.2rem 0 0 0; color: #636e72; font-size: 0.9rem;">
-                            Similarity Score: <strong>{row['Similarity Score (%)']}</strong>
-                        </p>
-                    </div>
-                </div>
-                <span class="match-badge {match_class}">{row['Match Level']}</span>
+        badges = [f"<span class='keyword-badge skill-badge'>{html.escape(skill)}</span>" for skill in row.get("Matched Skills", "").split(", ")[:CARD_SKILLS] if skill]
+        badges += [f"<span class='keyword-badge'>{html.escape(kw)}</span>" for kw in row.get("Matched Keywords", "").split(", ")[:CARD_KEYWORDS] if kw]
+        keyword_html = "<div>" + " ".join(badges) + "</div>" if badges else ""
+
+        # No blank or indented lines: either would end the HTML block inside the markdown payload
+        cards.append(
+            '<div class="ranking-card">'
+            '<div style="display: flex; align-items: center; justify-content: space-between;">'
+            '<div style="display: flex; align-items: center;">'
+            f'<span class="rank-badge">{row["Rank"]}</span>'
+            '<div>'
+            f'<h4 style="margin: 0; color: #2d3436; font-size: 1.1rem;">{html.escape(row["Resume"])}</h4>'
+            '<p style="margin: 0.2rem 0 0 0; color: #636e72; font-size: 0.9rem;">'
+            f'Similarity Score: <strong>{row["Similarity Score (%)"]}</strong>'
+            '</p>'
+            f'{keyword_html}'
+            '</div>'
+            '</div>'
+            f'<span class="match-badge {match_class}">{row["Match Level"]}</span>'
+            '</div>'
+            '</div>'
+        )
+    if cards:
+        st.markdown("\n".join(cards), unsafe_allow_html=True)
+
+# Function to show the page-size selector shared by every ranking on the page
+def select_page_size():
+    return st.selectbox(
+        "👥 Candidates per page",
+        RESULTS_PAGE_SIZES,
+        index=RESULTS_PAGE_SIZES.index(RESULTS_PAGE_SIZE),
+        key="results_page_size"
+    )
+
+# Function to pick the zero-based page of a ranking to show; only that page is ever ranked and rendered
+def select_page(total, page_size, key="results_page", label="Page"):
+    page_count = max(1, -(-total // page_size))
+    # A smaller ranking (a filter, a bigger page size) can leave the kept page out of range
+    if st.session_state.get(key, 1) > page_count:
+        st.session_state[key] = page_count
+    if page_count == 1:
+        return 0
+    return st.number_input(
+        f"{label} (of {page_count}, {total} candidates)",
+        min_value=1,
+        max_value=page_count,
+        step=1,
+        key=key
+    ) - 1
+
+# Function to score job descriptions with the pre-fitted model, applying only what changed since the last run
+def calculate_incremental_similarity(queries, resumes, vectorizer, vector_cache, resume_keys, previous_scorers=None):
+    if previous_scorers:
+        # Same resumes and model as last run: their posting columns are reused as they are
+        postings = previous_scorers[0].postings
+    else:
+        postings = vector_cache.matrix(resume_keys, resumes, vectorizer.transform)
+    queries = sp.vstack(queries, format="csr")
+    scorers = []
+    for i in range(queries.shape[0]):
+        if previous_scorers and i < len(previous_scorers):
+            scorers.append(previous_scorers[i].update(queries[i]))
+        else:
+            scorers.append(scoring.IncrementalScores(postings, queries[i]))
+    return np.vstack([scorer.scores for scorer in scorers]), scorers
+
+# Function to vectorize every resume's sections with the model that scored the whole resumes, section by section
+def vectorize_sections(resumes_data, vectorizer, field_cache=None, document_frequency=None):
+    sections = resume_processing.SECTIONS
+    documents = [resume_processing.section_tokens(r["analysis"], name) for name in sections for r in resumes_data]
+    keys = [(r["sha256"], name) for name in sections for r in resumes_data]
+    if isinstance(vectorizer, scoring.HashingEngine):
+        # Section counts are cached; IDF comes from the whole batch, as for the resumes
+        count = lambda docs: vectorizer.count(docs)[0]
+        counts = field_cache.matrix(keys, documents, count) if field_cache is not None else count(documents)
+        matrix = vectorizer.weight(counts, document_frequency)
+    elif field_cache is not None:
+        matrix = field_cache.matrix(keys, documents, vectorizer.transform)
+    else:
+        matrix = vectorizer.transform(documents)
+    n = len(resumes_data)
+    return [matrix[i * n:(i + 1) * n] for i in range(len(sections))]
+
+# Function to rescore a run for field weights from its block matrix, without vectorizing anything again
+def apply_field_weights(run, weights):
+    if run is None or run.get("field_weights") == weights:
+        return run
+    if weights == DEFAULT_FIELD_WEIGHTS or not any(weight for _, weight in weights):
+        run.update(run["unweighted"])
+    else:
+        field_weights = dict(weights)
+        queries = run["fields"].queries(run["queries"], field_weights)
+        similarity = run["fields"].scores(run["queries"], field_weights)
+        run.update(
+            similarity=similarity,
+            results=scoring.RankedResults(similarity[0]),
+            keywords=[
+                scoring.top_contributions(queries[i], run["fields"].matrix, MATCHED_KEYWORDS * len(FIELDS))
+                for i in range(queries.shape[0])
+            ],
+        )
+    run["field_weights"] = weights
+    return run
+
+# Function to rank resumes against one or more job descriptions, kept across reruns
+def score_roles(job_descriptions, resumes_data, prefitted=None, vector_cache=None, previous_scorers=None, model_key=None, field_cache=None, previous_fields=None):
+    # Query vectors come from the JD cache: unnormalized weights for the corpus model, term counts for hashing
+    if prefitted is None:
+        vectorize = None
+    elif isinstance(prefitted, scoring.HashingEngine):
+        vectorize = lambda tokens: prefitted.count([tokens])[0]
+    else:
+        vectorize = lambda tokens: scoring.query_weights(prefitted, [tokens])
+    job_analyses, job_vectors = analyze_job_descriptions(job_descriptions, model_key, vectorize)
+    job_tokens = [a["tokens"] for a in job_analyses]
+    resume_tokens = [r["analysis"]["tokens"] for r in resumes_data]
+    resume_keys = [r["sha256"] for r in resumes_data]
+    if not job_descriptions or not resumes_data:
+        return None
+    scorers = None
+    try:
+        from sklearn.preprocessing import normalize
+        from sklearn.metrics.pairwise import cosine_similarity
+
+        incremental = vector_cache is not None and not isinstance(prefitted, scoring.HashingEngine)
+        if incremental:
+            # Pre-fitted weights do not depend on the batch, so scores are linear in the JD vector
+            similarity, scorers = calculate_incremental_similarity(
+                job_vectors, resume_tokens, prefitted, vector_cache, resume_keys, previous_scorers
+            )
+            vectorizer = prefitted
+            queries = [normalize(scorer.query) for scorer in scorers]
+            resume_matrix = scorers[0].postings
+        else:
+            # Batch-fitted and hashed IDF weights change with the JD itself, so the batch is rescored
+            tfidf_matrix, vectorizer = vectorize_documents(
+                job_tokens, resume_tokens, prefitted, vector_cache, resume_keys,
+                job_vectors if vector_cache is not None else None
+            )
+            n_roles = len(job_descriptions)
+            queries = [tfidf_matrix[i] for i in range(n_roles)]
+            resume_matrix = tfidf_matrix[n_roles:]
+            # One sparse matrix-matrix product gives the full roles x candidates matrix
+            similarity = cosine_similarity(tfidf_matrix[:n_roles], resume_matrix)
+
+        # Each candidate's keywords are the JD terms adding most to its score, for every candidate in one pass
+        keywords = [scoring.top_contributions(query, resume_matrix, MATCHED_KEYWORDS) for query in queries]
+        keyword_names = [scoring.feature_names(vectorizer, tokens) for tokens in job_tokens]
+
+        # Section vectors sit beside the resume vectors, so field weights rescore with one product
+        document_frequency = None
+        if isinstance(prefitted, scoring.HashingEngine):
+            document_frequency = scoring.DocumentFrequency(prefitted.n_features).update(sp.vstack(job_vectors, format="csr"))
+            if vector_cache is not None:
+                document_frequency.update(vector_cache.matrix(resume_keys, resume_tokens, None))
+            else:
+                document_frequency.update(prefitted.count(resume_tokens)[0])
+        if incremental and previous_scorers and previous_fields is not None:
+            # Same resumes and model as the previous run: its section vectors are still exact
+            fields = previous_fields
+        else:
+            fields = scoring.FieldMatrix(
+                FIELDS, [resume_matrix] + vectorize_sections(resumes_data, vectorizer, field_cache, document_frequency)
+            )
+    except Exception as e:
+        st.error(f"Error calculating similarity: {str(e)}")
+        return None
+    results = scoring.RankedResults(similarity[0])
+    return {
+        "job_descriptions": job_descriptions,
+        "job_analysis": job_analyses[0],
+        "resumes_data": resumes_data,
+        "similarity": similarity,
+        "results": results,
+        "scorers": scorers,
+        "keywords": keywords,
+        "keyword_names": keyword_names,
+        "queries": sp.vstack(queries, format="csr"),
+        "fields": fields,
+        "field_weights": DEFAULT_FIELD_WEIGHTS,
+        "unweighted": {"similarity": similarity, "results": results, "keywords": keywords},
+        # Dictionary skills, matched on the raw text so multi-word names like "machine learning" survive
+        "job_skills": [skill_matcher.distinct_skills(resume_processing.find_skills(jd)) for jd in job_descriptions],
+        "resume_skills": [frozenset(name for name, _, _ in r.get("skills", ())) for r in resumes_data],
+    }
+
+# Function to get this session's background extractor, started afresh when the tokenizer changes
+def get_extractor(parallel, ready=None):
+    tokenizer = st.session_state.get("tokenizer") or resume_processing.DEFAULT_TOKENIZER
+    extractor = st.session_state.get("extractor")
+    if extractor is None or extractor.tokenizer != tokenizer:
+        if extractor is not None:
+            extractor.cancel()
+        extractor = st.session_state["extractor"] = resume_processing.BackgroundExtractor(
+            tokenizer, parallel, cache=get_text_cache(), ready=ready
+        )
+    # Only jobs submitted from now on follow a changed parallel setting
+    extractor.parallel = parallel
+    return extractor
+
+# Function to hash uploads by content, hashing each uploaded file only once per session
+def get_upload_digests(uploaded_files):
+    known = st.session_state.setdefault("upload_digests", {})
+    digests = []
+    for f in uploaded_files:
+        file_id = getattr(f, "file_id", None)
+        digest = known.get(file_id) if file_id else None
+        if digest is None:
+            digest = resume_processing.content_hash(f.getvalue())
+            if file_id:
+                known[file_id] = digest
+        digests.append(digest)
+    return digests
+
+# Function to list uploads with their background processing status, refreshed until every job finishes
+def display_upload_status(uploaded_files, digests, extractor):
+    labels = {"queued": "⏳ queued", "processing": "⚙️ processing", "ready": "✅ ready", "failed": "❌ failed", "removed": "—"}
+    polling = extractor.pending(digests) > 0
+
+    @st.fragment(run_every=1.0 if polling else None)
+    def upload_status():
+        statuses = [extractor.status(digest) for digest in digests]
+        ready = statuses.count("ready")
+        with st.expander(f"📋 View uploaded files ({len(uploaded_files)}) · {ready} processed"):
+            st.markdown("\n".join(
+                f"{i}. {file.name} ({file.size / 1024:.1f} KB) · {labels[status]}"
+                for i, (file, status) in enumerate(zip(uploaded_files, statuses), 1)
+            ))
+        if polling and not extractor.pending(digests):
+            # Stop polling once everything has finished
+            st.rerun()
+
+    upload_status()
+
+# Function to collect the processed uploads, waiting only for background jobs that have not finished
+def process_uploads(uploaded_files, digests, extractor):
+    # Failed uploads are tried once more, now that the user asked for results
+    extractor.sync([(f.name, f.getvalue()) for f in uploaded_files], digests, retry_failed=True)
+    waiting = extractor.pending(digests)
+    unique = len(set(digests))
+    if waiting:
+        progress_bar = st.progress(0)
+        status_text = st.empty()
+
+    n_new = 0
+    results = {}
+    with st.spinner("🔄 Analyzing resumes with AI algorithms..."):
+        for i, (digest, result) in enumerate(extractor.results(digests)):
+            if waiting:
+                status_text.markdown(f"**Processed:** {result['name']} ({i+1}/{unique})")
+                progress_bar.progress((i + 1) / unique)
+            results[digest] = result
+
+            # Problems are reported once, when the result is first collected
+            if result.get("reported"):
+                continue
+            result["reported"] = True
+            n_new += 1
+
+            # Resumes that still have text (basic cleaning after an NLTK failure) are ranked with a warning
+            for error in result["errors"]:
+                if result["processed_text"]:
+                    st.warning(f"⚠️ {result['name']}: {error}")
+                else:
+                    st.error(f"❌ Error processing {result['name']}: {error}")
+
+            if result["raw_text"] and not result["processed_text"]:
+                st.warning(f"⚠️ Could not process text from {result['name']}")
+            elif not result["raw_text"] and not result["errors"]:
+                st.warning(f"⚠️ Could not extract text from {result['name']}")
+
+    if waiting:
+        # Clear progress indicators
+        progress_bar.empty()
+        status_text.empty()
+
+    # Each upload takes its current name and position
+    resumes_data = [
+        dict(results[digest], index=i, name=f.name)
+        for i, (digest, f) in enumerate(zip(digests, uploaded_files))
+        if results[digest]["processed_text"]
+    ]
+    return resumes_data, n_new
+
+# Function to display one page of single-role rankings plus whole-batch summaries
+def display_single_role_results(run):
+    if run is None:
+        st.error("❌ Could not calculate similarity scores. Please try again.")
+        return
+
+    results = run["results"]
+    resumes_data = run["resumes_data"]
+    resume_names = [r['name'] for r in resumes_data]
+
+    # Success message
+    st.markdown("""
+    <div class="custom-alert-success">
+        🎉 Analysis complete! Here are your ranked results:
+    </div>
+    """, unsafe_allow_html=True)
+
+    # Results section
+    st.markdown("""
+    <div class="results-section">
+        <div class="section-header">
+            <span class="section-icon">🏆</span>
+            <h3>Resume Rankings</h3>
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # Required skills narrow the ranking to the candidates that mention them all
+    candidates = filter_by_required_skills(run)
+    if candidates is not None:
+        if not len(candidates):
+            st.info("ℹ️ No candidate mentions every required skill.")
+            return
+        results = scoring.RankedResults(results.scores[candidates])
+
+    # Only the requested page is ranked and turned into rows
+    page_size = select_page_size()
+    page = select_page(len(results), page_size)
+    indices, scores = results.page(page, page_size)
+    if candidates is not None:
+        indices = candidates[indices]
+    rankings_df = build_rankings_df(
+        resume_names, indices, scores, first_rank=page * page_size + 1,
+        keywords=lambda index: get_matched_keywords(run, index),
+        skills=lambda index: get_matched_skills(run, index)
+    )
+
+    # Display ranking cards
+    display_ranking_cards(rankings_df)
+
+    # Data table
+    with st.expander("📊 View detailed ranking table"):
+        st.dataframe(rankings_df, use_container_width=True, hide_index=True)
+
+    # Top match analysis
+    top_indices, top_scores = results.top(1)
+    if candidates is not None:
+        top_indices = candidates[top_indices]
+    top_resume_data = resumes_data[top_indices[0]]
+    top_score = top_scores[0]
+
+    st.markdown(f"""
+    <div class="results-section">
+        <div class="section-header">
+            <span class="section-icon">🎯</span>
+            <h3>Top Match Analysis: {html.escape(top_resume_data['name'])}</h3>
+        </div>
+        <p style="color: #636e72; font-size: 1rem; margin: 0;">
+            Similarity Score: <strong>{top_score * 100:.2f}%</strong> | 
+            Match Level: <strong>{get_match_level(top_score)}</strong>
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    matched_skills = get_matched_skills(run, top_indices[0])
+    if matched_skills:
+        st.write("**🧩 Matched Skills:**")
+        skill_html = " ".join([f"<span class='keyword-badge skill-badge'>{html.escape(skill)}</span>" for skill in matched_skills])
+        st.markdown(skill_html, unsafe_allow_html=True)
+
+    # Get matched keywords
+    matched_keywords = get_matched_keywords(run, top_indices[0])
+
+    if matched_keywords:
+        st.write("**🔑 Matched Keywords:**")
+        # Display keywords as modern badges
+        keyword_html = " ".join([f"<span class='keyword-badge'>{html.escape(kw)}</span>" for kw in matched_keywords])
+        st.markdown(keyword_html, unsafe_allow_html=True)
+    else:
+        st.info("ℹ️ No specific keyword matches found in top resume.")
+
+    # Visualization
+    if len(rankings_df) > 1:
+        st.markdown("""
+        <div class="results-section">
+            <div class="section-header">
+                <span class="section-icon">📈</span>
+                <h3>Similarity Score Visualization</h3>
             </div>
         </div>
         """, unsafe_allow_html=True)
 
+        fig = create_similarity_chart(rankings_df)
+        st.plotly_chart(fig, use_container_width=True)
+
+    # Summary insights, computed over every candidate without building rows
+    all_scores = results.scores
+    excellent_count = int(np.count_nonzero(all_scores > 0.3))
+    good_count = int(np.count_nonzero((all_scores > 0.15) & (all_scores <= 0.3)))
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("🌟 Excellent Matches", excellent_count, f"{excellent_count/len(results)*100:.0f}% of total")
+    with col2:
+        st.metric("👍 Good Matches", good_count, f"{good_count/len(results)*100:.0f}% of total")
+    with col3:
+        avg_score = float(all_scores.mean()) * 100
+        st.metric("📊 Average Score", f"{avg_score:.1f}%", "overall compatibility")
+
+# Function to display the rankings of several job descriptions scored at once
+def display_multi_role_results(run):
+    import pandas as pd
+    import plotly.express as px
+
+    if run is None:
+        st.error("❌ Could not calculate similarity scores. Please try again.")
+        return
+
+    similarity = run["similarity"]
+    resume_names = [r['name'] for r in run["resumes_data"]]
+    role_titles = [get_role_title(jd, i) for i, jd in enumerate(run["job_descriptions"], start=1)]
+
+    st.markdown(f"""
+    <div class="custom-alert-success">
+        🎉 Analysis complete! Ranked {len(resume_names)} candidates against {len(role_titles)} roles:
+    </div>
+    """, unsafe_allow_html=True)
+
+    # One page size for the best-fit table and every role's rankings
+    page_size = select_page_size()
+
+    # Best-fit role per candidate, ranked a page at a time like the role rankings
+    best_roles = similarity.argmax(axis=0)
+    best_scores = similarity.max(axis=0)
+
+    st.markdown("""
+    <div class="results-section">
+        <div class="section-header">
+            <span class="section-icon">🧭</span>
+            <h3>Best-Fit Role per Candidate</h3>
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+    page = select_page(len(resume_names), page_size, key="best_fit_page")
+    order, _ = scoring.RankedResults(best_scores).page(page, page_size)
+    best_fit_df = pd.DataFrame([{
+        "Rank": rank,
+        "Resume": resume_names[i],
+        "Best-Fit Role": role_titles[best_roles[i]],
+        "Similarity Score (%)": f"{best_scores[i] * 100:.2f}%",
+        "Match Level": get_match_level(best_scores[i])
+    } for rank, i in enumerate(order, start=page * page_size + 1)])
+    st.dataframe(best_fit_df, use_container_width=True, hide_index=True)
+
+    # Roles x candidates view of the best-fit page's candidates
+    fig = px.imshow(
+        similarity[:, order] * 100,
+        x=[name[:25] + "..." if len(name) > 25 else name for name in (resume_names[i] for i in order)],
+        y=role_titles,
+        color_continuous_scale="Purples",
+        aspect="auto",
+        labels=dict(x="Resumes", y="Roles", color="Similarity (%)")
+    )
+    fig.update_layout(
+        title="Roles vs Candidates Similarity",
+        title_x=0.5,
+        height=max(400, len(role_titles) * 40),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#2d3436', size=12)
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+    # Per-role rankings, one page each
+    for role, (tab, scores) in enumerate(zip(st.tabs(role_titles), similarity)):
+        with tab:
+            candidates = filter_by_required_skills(run, role, key=f"required_skills_{role}")
+            if candidates is not None:
+                if not len(candidates):
+                    st.info("ℹ️ No candidate mentions every required skill.")
+                    continue
+                scores = scores[candidates]
+            page = select_page(len(scores), page_size, key=f"role_page_{role}")
+            indices, ranked_scores = scoring.RankedResults(scores).page(page, page_size)
+            if candidates is not None:
+                indices = candidates[indices]
+            rankings_df = build_rankings_df(
+                resume_names, indices, ranked_scores, first_rank=page * page_size + 1,
+                keywords=lambda index: get_matched_keywords(run, index, role),
+                skills=lambda index: get_matched_skills(run, index, role)
+            )
+            display_ranking_cards(rankings_df)
+            with st.expander("📊 View detailed ranking table"):
+                st.dataframe(rankings_df, use_container_width=True, hide_index=True)
+
 # Main Streamlit app
 def main():
     # Header
@@ -422,6 +1070,93 @@ def main():
         st.metric("💰 Cost Savings", "78%", "reduced hiring time")
 
     st.markdown("<br>", unsafe_allow_html=True)
+
+    warmup_state = get_warmup()
+
+    # Scoring settings
+    with st.sidebar:
+        st.markdown("### ⚙️ Scoring Settings")
+        scoring_engine = st.radio(
+            "Scoring engine",
+            ["TF-IDF", "Feature hashing"],
+            key="scoring_engine",
+            help="Feature hashing needs no fitted vocabulary, so large batches are vectorized in parallel. See the README for the accuracy/speed trade-off."
+        )
+
+        corpus_model = get_model_store().get()
+        if scoring_engine == "TF-IDF":
+            scoring_model = st.radio(
+                "TF-IDF model",
+                ["Fit on this batch", "Pre-fitted corpus model"],
+                index=1 if corpus_model else 0,
+                key="scoring_model",
+                disabled=corpus_model is None,
+                help="The corpus model is fitted once on historical resumes (python scoring.py <corpus_dir>), so scores are stable across batches."
+            )
+            if corpus_model:
+                st.caption(f"Corpus model {corpus_model['version']} · {corpus_model['n_documents']} resumes")
+            else:
+                st.caption("No corpus model found. Build one with `python scoring.py <corpus_dir>`.")
+        else:
+            hashing_features = st.select_slider(
+                "Hashed features",
+                options=[2 ** 16, 2 ** 18, 2 ** 20],
+                value=2 ** 18,
+                format_func=lambda n: f"2^{n.bit_length() - 1}",
+                key="hashing_features",
+                help="More features mean fewer hash collisions at the cost of memory."
+            )
+
+        st.radio(
+            "Tokenizer",
+            resume_processing.TOKENIZERS,
+            index=resume_processing.TOKENIZERS.index(resume_processing.DEFAULT_TOKENIZER),
+            format_func=lambda name: {"nltk": "NLTK word_tokenize", "fast": "Fast regex"}[name],
+            key="tokenizer",
+            help="The fast tokenizer keeps the same words as NLTK's (checked by benchmarks/tokenizer_parity.py) and is several times faster."
+        )
+
+        with st.expander("🎚️ Field weights"):
+            st.caption("How much a match in each part of a resume counts. Changing a weight re-ranks the current results without processing them again. Talent pool screening scores whole resumes only.")
+            default_weights = dict(DEFAULT_FIELD_WEIGHTS)
+            field_weights = tuple(
+                (field, st.slider(FIELD_LABELS[field], 0.0, 3.0, default_weights[field], step=0.25, key=f"field_weight_{field}"))
+                for field in FIELDS
+            )
+            if not any(weight for _, weight in field_weights):
+                st.caption("⚠️ All weights are zero, so the whole resume is scored.")
+
+        if warmup_state.ready:
+            st.caption("✅ Language models and scoring engine ready")
+        elif not warmup_state.done:
+            st.caption("⏳ Loading language models in the background...")
+        else:
+            st.caption("⚠️ " + " ".join(f"{name}: {error}" for name, error in warmup_state.errors.items()))
+
+        pool = get_pool_store().get()
+        screening_source = st.radio(
+            "Screening source",
+            ["Uploaded resumes", "Talent pool"],
+            key="screening_source",
+            disabled=pool is None,
+            help="Score the job description against every stored candidate (python talent_pool.py build <corpus_dir>) instead of uploaded PDFs."
+        )
+        if pool is not None:
+            st.caption(f"Talent pool · {len(pool):,} candidates")
+            pool_top_n = st.slider("Talent pool matches to show", 10, 200, 50, step=10, key="pool_top_n")
+            pool_engine = st.radio(
+                "Retrieval engine",
+                ["scan", "maxscore"],
+                format_func=lambda engine: {"scan": "Sparse scan", "maxscore": "Inverted index (MaxScore)"}[engine],
+                key="pool_engine",
+                help="Both return identical rankings. MaxScore skips candidates that cannot reach the top matches, which is fastest for job descriptions with specific, rarer terms."
+            )
+            add_to_pool = st.checkbox(
+                "Add uploaded resumes to talent pool",
+                key="add_to_pool",
+                disabled=corpus_model is None,
+                help="Store processed uploads in the talent pool. Re-uploading the same file updates its entry."
+            )
     
     # Input sections
     col1, col2 = st.columns([1, 1])
@@ -443,6 +1178,12 @@ def main():
             key="job_desc",
             label_visibility="collapsed"
         )
+
+        multi_role = st.checkbox(
+            "📑 Screen against multiple roles",
+            key="multi_role",
+            help="Enter several job descriptions separated by a line containing only ---. The first line of each is used as the role name."
+        )
     
     with col2:
         st.markdown("""
@@ -470,10 +1211,23 @@ def main():
             </div>
             """, unsafe_allow_html=True)
             
-            # Show uploaded files
-            with st.expander(f"📋 View uploaded files ({len(uploaded_files)})"):
-                for i, file in enumerate(uploaded_files, 1):
-                    st.write(f"{i}. {file.name} ({file.size / 1024:.1f} KB)")
+            # Filled in below, once the parallel setting is known
+            upload_status = st.container()
+
+        parallel_processing = st.checkbox(
+            "⚡ Parallel processing",
+            value=(os.cpu_count() or 1) > 1,
+            key="parallel_processing",
+            help="Extract and preprocess resumes across all CPU cores. Recommended for large batches."
+        )
+
+        # Extraction starts as soon as files arrive, while the job description is still being written
+        extractor = get_extractor(parallel_processing, ready=warmup_state.wait)
+        upload_digests = get_upload_digests(uploaded_files or [])
+        extractor.sync([(f.name, f.getvalue()) for f in uploaded_files or []], upload_digests)
+        if uploaded_files:
+            with upload_status:
+                display_upload_status(uploaded_files, upload_digests, extractor)
 
     st.markdown("<br>", unsafe_allow_html=True)
     
@@ -482,8 +1236,26 @@ def main():
     with col2:
         process_clicked = st.button("🚀 Process and Rank Resumes", key="process_btn", use_container_width=True)
 
-    # Validation and processing
+    # A new run replaces the rankings kept across reruns
     if process_clicked:
+        previous_run = st.session_state.pop("screening_run", None)
+        wait_for_warmup(warmup_state)
+
+    # Talent pool screening needs only a job description
+    if process_clicked and screening_source == "Talent pool" and pool is not None:
+        if not job_description.strip():
+            st.markdown("""
+            <div class="custom-alert-warning">
+                ⚠️ Please enter a job description to proceed.
+            </div>
+            """, unsafe_allow_html=True)
+            return
+
+        display_talent_pool_results(job_description, pool, corpus_model, pool_top_n, pool_engine)
+        display_query_cache_stats()
+
+    # Validation and processing
+    elif process_clicked:
         if not uploaded_files:
             st.markdown("""
             <div class="custom-alert-warning">
@@ -510,143 +1282,63 @@ def main():
         </div>
         """, unsafe_allow_html=True)
 
-        resumes_data = []
-
-        # Progress indicators
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-        
-        with st.spinner("🔄 Analyzing resumes with AI algorithms..."):
-            for i, uploaded_file in enumerate(uploaded_files):
-                status_text.markdown(f"**Processing:** {uploaded_file.name} ({i+1}/{len(uploaded_files)})")
-                progress_bar.progress((i + 1) / len(uploaded_files))
-                
-                try:
-                    # Extract and preprocess text
-                    extracted_text = extract_text_from_pdf(uploaded_file)
-                    if extracted_text:
-                        preprocessed_text = preprocess_text(extracted_text)
-                        if preprocessed_text:  # Only add if preprocessing was successful
-                            resumes_data.append({
-                                "name": uploaded_file.name,
-                                "raw_text": extracted_text,
-                                "processed_text": preprocessed_text
-                            })
-                        else:
-                            st.warning(f"⚠️ Could not process text from {uploaded_file.name}")
-                    else:
-                        st.warning(f"⚠️ Could not extract text from {uploaded_file.name}")
-                except Exception as e:
-                    st.error(f"❌ Error processing {uploaded_file.name}: {str(e)}")
+        # Most uploads were processed in the background while the job description was written
+        resumes_data, n_new = process_uploads(uploaded_files, upload_digests, extractor)
 
-        # Clear progress indicators
-        progress_bar.empty()
-        status_text.empty()
+        cache_stats = get_text_cache().stats()
+        st.caption(
+            f"🗄️ Text cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses "
+            f"({cache_stats['hit_rate'] * 100:.0f}% hit rate, {cache_stats['entries']} stored resumes) · "
+            f"{n_new} new upload(s) processed, {len(uploaded_files) - n_new} reused from earlier runs"
+        )
 
         if resumes_data:
-            resume_texts_processed = [r['processed_text'] for r in resumes_data]
-            resume_names = [r['name'] for r in resumes_data]
+            if pool is not None and corpus_model is not None and st.session_state.get("add_to_pool"):
+                # Resumes this session already stored are skipped unless the pool lost them
+                pooled = st.session_state.setdefault("pooled_uploads", set())
+                new_to_pool = [
+                    r for r in resumes_data
+                    if (r["sha256"], extractor.tokenizer) not in pooled or f"sha256:{r['sha256']}" not in pool
+                ]
+                if new_to_pool and add_resumes_to_pool(pool, corpus_model, new_to_pool):
+                    pooled.update((r["sha256"], extractor.tokenizer) for r in new_to_pool)
 
             # Calculate cosine similarity
-            job_description_processed = preprocess_text(job_description)
-            ranked_resumes, vectorizer = calculate_cosine_similarity(job_description_processed, resume_texts_processed)
-
-            if ranked_resumes:
-                # Success message
-                st.markdown("""
-                <div class="custom-alert-success">
-                    🎉 Analysis complete! Here are your ranked results:
-                </div>
-                """, unsafe_allow_html=True)
-
-                # Create rankings data
-                rankings = []
-                for rank, (index, score) in enumerate(ranked_resumes, start=1):
-                    rankings.append({
-                        "Rank": rank,
-                        "Resume": resume_names[index],
-                        "Similarity Score (%)": f"{score * 100:.2f}%",
-                        "Match Level": "Excellent" if score > 0.3 else "Good" if score > 0.15 else "Fair" if score > 0.05 else "Poor"
-                    })
-                
-                rankings_df = pd.DataFrame(rankings)
-
-                # Results section
-                st.markdown("""
-                <div class="results-section">
-                    <div class="section-header">
-                        <span class="section-icon">🏆</span>
-                        <h3>Resume Rankings</h3>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                # Display ranking cards
-                display_ranking_cards(rankings_df)
-
-                # Data table
-                with st.expander("📊 View detailed ranking table"):
-                    st.dataframe(rankings_df, use_container_width=True, hide_index=True)
-
-                # Top match analysis
-                if ranked_resumes:
-                    top_ranked_original_index = ranked_resumes[0][0]
-                    top_resume_data = resumes_data[top_ranked_original_index]
-                    top_score = ranked_resumes[0][1]
-                    
-                    st.markdown(f"""
-                    <div class="results-section">
-                        <div class="section-header">
-                            <span class="section-icon">🎯</span>
-                            <h3>Top Match Analysis: {top_resume_data['name']}</h3>
-                        </div>
-                        <p style="color: #636e72; font-size: 1rem; margin: 0;">
-                            Similarity Score: <strong>{top_score * 100:.2f}%</strong> | 
-                            Match Level: <strong>{"Excellent" if top_score > 0.3 else "Good" if top_score > 0.15 else "Fair" if top_score > 0.05 else "Poor"}</strong>
-                        </p>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                    # Get matched keywords
-                    matched_keywords = get_matched_keywords(job_description, top_resume_data['raw_text'])
-                    
-                    if matched_keywords:
-                        st.write("**🔑 Matched Keywords:**")
-                        # Display keywords as modern badges
-                        keyword_html = " ".join([f"<span class='keyword-badge'>{kw}</span>" for kw in matched_keywords])
-                        st.markdown(keyword_html, unsafe_allow_html=True)
-                    else:
-                        st.info("ℹ️ No specific keyword matches found in top resume.")
-
-                # Visualization
-                if len(rankings) > 1:
-                    st.markdown("""
-                    <div class="results-section">
-                        <div class="section-header">
-                            <span class="section-icon">📈</span>
-                            <h3>Similarity Score Visualization</h3>
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                    fig = create_similarity_chart(rankings_df)
-                    st.plotly_chart(fig, use_container_width=True)
-
-                # Summary insights
-                excellent_count = len([r for r in rankings if r['Match Level'] == 'Excellent'])
-                good_count = len([r for r in rankings if r['Match Level'] == 'Good'])
-                
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    st.metric("🌟 Excellent Matches", excellent_count, f"{excellent_count/len(rankings)*100:.0f}% of total")
-                with col2:
-                    st.metric("👍 Good Matches", good_count, f"{good_count/len(rankings)*100:.0f}% of total")
-                with col3:
-                    avg_score = sum([float(r["Similarity Score (%)"].replace("%", "")) for r in rankings]) / len(rankings)
-                    st.metric("📊 Average Score", f"{avg_score:.1f}%", "overall compatibility")
+            if scoring_engine == "Feature hashing":
+                prefitted = get_hashing_engine(hashing_features)
+                vector_key = ("hashing", hashing_features)
+            elif corpus_model and scoring_model == "Pre-fitted corpus model":
+                prefitted = corpus_model["vectorizer"]
+                vector_key = ("corpus", corpus_model["version"])
+            else:
+                # A batch-fitted vocabulary depends on every document, so nothing is cached
+                prefitted, vector_key = None, ("batch",)
+            job_descriptions = split_job_descriptions(job_description) if multi_role else [job_description]
+            vector_key += (st.session_state.get("tokenizer"),)
+            signature = (vector_key, tuple(job_descriptions), tuple((r["sha256"], r["name"]) for r in resumes_data))
 
+            if previous_run is not None and previous_run.get("signature") == signature:
+                # Nothing changed since the last run: keep its scores and the page being viewed
+                st.session_state["screening_run"] = previous_run
             else:
-                st.error("❌ Could not calculate similarity scores. Please try again.")
+                # Only the job descriptions changed: their edits are applied to the previous scores
+                previous_scorers = previous_fields = None
+                if previous_run is not None and previous_run["signature"][::2] == signature[::2]:
+                    previous_scorers = previous_run.get("scorers")
+                    previous_fields = previous_run.get("fields")
+                vector_cache = get_vector_cache(vector_key) if prefitted is not None else None
+                field_cache = get_vector_cache(vector_key, "field_vector_cache") if prefitted is not None else None
+                run = score_roles(
+                    job_descriptions, resumes_data, prefitted, vector_cache, previous_scorers, vector_key, field_cache, previous_fields
+                )
+                if run is not None:
+                    run["signature"] = signature
+                st.session_state["screening_run"] = run
+                st.session_state["results_page"] = 1
+                # Skill filters and role pages refer to the previous job descriptions
+                for key in [key for key in st.session_state if str(key).startswith(("required_skills", "role_page_", "best_fit_page"))]:
+                    del st.session_state[key]
+                display_query_cache_stats()
         else:
             st.markdown("""
             <div class="custom-alert-warning">
@@ -654,6 +1346,14 @@ def main():
             </div>
             """, unsafe_allow_html=True)
 
+    # Rankings persist across reruns so widgets can be used without processing again
+    if "screening_run" in st.session_state:
+        run = apply_field_weights(st.session_state["screening_run"], field_weights)
+        if run is not None and len(run["job_descriptions"]) > 1:
+            display_multi_role_results(run)
+        else:
+            display_single_role_results(run)
+
     # Instructions section
     with st.expander("📚 How to use this AI tool"):
         st.markdown("""
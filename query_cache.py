@@ -0,0 +1,81 @@
+import os
+import re
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_ENTRIES = int(os.environ.get("RESUME_QUERY_CACHE_ENTRIES", 256))
+
+
+class QueryCache:
+    """
+    Bounded in-memory LRU of analyzed and vectorized job descriptions.
+
+    One cache is shared by every session of the app, so a standard job
+    description template is preprocessed and vectorized once per model
+    rather than once per run. Entries are keyed by the normalized text,
+    the tokenizer and the model that vectorized it, and hold the analysis
+    record plus the sparse query vector (None for models that cannot
+    vectorize a query on its own, such as a batch-fitted vocabulary).
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize(text):
+        """
+        Function to normalize a job description so whitespace-only edits share an entry.
+
+        Line breaks are kept because section detection depends on them.
+        """
+        lines = [re.sub(r"[ \t]+", " ", line).rstrip() for line in text.strip().splitlines()]
+        return "\n".join(lines)
+
+    def make_key(self, text, tokenizer, model_key=None):
+        """
+        Function to build the cache key of a job description for a tokenizer and model.
+        """
+        return self.normalize(text), tokenizer, model_key
+
+    def get(self, key):
+        """
+        Function to look up (analysis, vector) for a key, or None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, analysis, vector=None):
+        """
+        Function to store an analyzed job description and evict the least recently used entries.
+        """
+        with self._lock:
+            self._entries[key] = (analysis, vector)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self):
+        """
+        Function to report hit/miss counters and the current number of entries.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "evictions": self.evictions,
+            }
@@ -0,0 +1,760 @@
+import io
+import os
+import re
+import glob
+import sqlite3
+import hashlib
+import threading
+import functools
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+import skill_matcher
+from lemma_table import LemmaTable
+
+# nltk and pdfplumber take seconds to import, so they are imported by the
+# functions that use them; importing this module stays cheap for the UI
+
+# Bump whenever extraction or preprocessing output changes, to invalidate cached text
+EXTRACTOR_VERSION = "4"
+
+# Shared worker pool, created on first parallel run and reused across reruns
+_process_pool = None
+_process_pool_workers = 0
+# Session threads and the warm-up thread all ask for the pool; only one may create or replace it
+_process_pool_lock = threading.Lock()
+
+# Background thread for speculative extraction when parallel processing is off
+_background_threads = None
+_background_lock = threading.Lock()
+
+# Per-process preprocessors, one per tokenizer, created on first use
+_preprocessors = {}
+_preprocessor_lock = threading.Lock()
+
+# Per-process handle on the on-disk lemma table, opened with the first preprocessor
+_lemma_table = None
+
+# "nltk" runs word_tokenize (Punkt + Treebank); "fast" runs FastTokenizer
+TOKENIZERS = ("nltk", "fast")
+DEFAULT_TOKENIZER = os.environ.get("RESUME_TOKENIZER", "nltk")
+
+# Resume vocabulary repeats heavily, so a bounded memo catches most lemma lookups
+LEMMA_CACHE_SIZE = 100000
+
+# Resume sections the segmenter keeps, in the order they are usually written
+SECTIONS = ("summary", "experience", "education", "skills", "certifications")
+
+# Heading lines and the section each one starts; headings mapped to None end the section
+# before them without starting a kept one
+SECTION_HEADINGS = {
+    **dict.fromkeys([
+        "summary", "professional summary", "career summary", "executive summary", "profile",
+        "professional profile", "personal profile", "objective", "career objective", "about me", "overview",
+    ], "summary"),
+    **dict.fromkeys([
+        "experience", "work experience", "professional experience", "relevant experience", "employment",
+        "employment history", "work history", "career history", "additional experience", "internships",
+        "internship experience",
+    ], "experience"),
+    **dict.fromkeys([
+        "education", "academic background", "academic qualifications", "education and training",
+        "educational background", "academics",
+    ], "education"),
+    **dict.fromkeys([
+        "skills", "technical skills", "key skills", "core skills", "skills summary", "core competencies",
+        "competencies", "expertise", "areas of expertise", "technologies", "tools and technologies",
+    ], "skills"),
+    **dict.fromkeys([
+        "certifications", "certificates", "certification", "licenses", "licenses and certifications",
+        "certifications and licenses", "professional certifications",
+    ], "certifications"),
+    **dict.fromkeys([
+        "projects", "personal projects", "academic projects", "awards", "honors", "honors and awards",
+        "achievements", "publications", "languages", "interests", "hobbies", "references", "volunteering",
+        "volunteer experience", "activities", "extracurricular activities", "contact", "contact information",
+    ], None),
+}
+
+# Headings are short; longer lines are body text and are not normalized
+HEADING_MAX_CHARS = 40
+HEADING_NOISE_PATTERN = re.compile(r"[^a-z]+|\band\b")
+
+
+def extract_text(data):
+    """
+    Function to extract text from the raw bytes of a PDF file.
+    """
+    import pdfplumber
+
+    text = ""
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        for page in pdf.pages:
+            page_text = page.extract_text()
+            if page_text:
+                text += page_text + "\n"
+    return text.strip()
+
+
+def find_resume_files(directory):
+    """
+    Function to list the resume files (.pdf or .txt) under a directory.
+    """
+    return sorted(
+        glob.glob(os.path.join(directory, "**", "*.pdf"), recursive=True)
+        + glob.glob(os.path.join(directory, "**", "*.txt"), recursive=True)
+    )
+
+
+def read_resume_file(path):
+    """
+    Function to read the raw text of a resume stored on disk as PDF or plain text.
+    """
+    if path.lower().endswith(".pdf"):
+        with open(path, "rb") as f:
+            return extract_text(f.read())
+    with open(path, encoding="utf-8", errors="ignore") as f:
+        return f.read()
+
+
+def load_sentence_tokenizer(language="english"):
+    """
+    Function to load the Punkt sentence tokenizer word_tokenize uses.
+    """
+    try:
+        from nltk.tokenize.punkt import PunktTokenizer
+    except ImportError:
+        # NLTK releases before punkt_tab ship the model as a pickle
+        import nltk
+        return nltk.data.load(f"tokenizers/punkt/{language}.pickle")
+    return PunktTokenizer(language)
+
+
+class FastTokenizer:
+    """
+    Regex tokenizer giving the same alphanumeric tokens as NLTK's word_tokenize.
+
+    word_tokenize splits sentences with Punkt and then runs a couple of dozen
+    Treebank substitutions over each one, but preprocessing keeps only
+    isalnum() tokens. Sentences are still split by Punkt, which is cheap;
+    the Treebank pass is replaced by dropping every character it always
+    splits off, then splitting only what can still yield an alphanumeric
+    token (commas and colons, quotes, clitics and contractions), each in a
+    single pass over the whole text.
+
+    One Treebank quirk is not reproduced: a clitic followed by a stray
+    closing quote at the very end of a sentence ("it's'") is split here.
+    """
+
+    # Closing brackets and quotes Treebank allows after a sentence-final period
+    CLOSERS = "])}>\"'\u00bb\u201d\u2019 "
+    # Everything Treebank always makes a token of its own; none of it is alphanumeric
+    SPLIT_PATTERN = re.compile("[;@#$%&?!*()\\[\\]{}<>\"`\u00ab\u00bb\u201c\u201d\u2018\u2019\u201e\u2012-\u2015]|--|''|\\.{2,}")
+    # Like Treebank, a split comma or colon consumes the character after it
+    SEPARATOR_PATTERN = re.compile(r"[:,]([^\d])")
+    # Patterns start with a literal so the regex engine can skip ahead to candidates
+    LEADING_QUOTE_PATTERN = re.compile(r"'(?<!\w')(?!(?:re|ve|ll|m|t|s|d|n)\b)(?=\w)")
+    # Treebank splits a closing quote, then 's 'm 'd, then 'll 're 've n't off the end of a word
+    CLITIC_PATTERNS = (
+        re.compile(r"'(?<=[^'\s]')(?=\s|$)"),
+        re.compile(r"'(?<=[^'\s]')[smd]?(?=\s|$)"),
+        re.compile(r"(?:'(?<=[^'\s]')(?:ll|re|ve)|n(?<=[^'\s]n)'t)(?=\s|$)"),
+    )
+    CONTRACTIONS = ("cannot", "d'ye", "gimme", "gonna", "gotta", "lemme", "more'n", "wanna")
+    CONTRACTION_PATTERN = re.compile(
+        r"\b(?:(can)(not)|(d)('ye)|(gim)(me)|(gon)(na)|(got)(ta)|(lem)(me)|(more)('n))\b|\b(wan)(na)(?=\s|$)"
+    )
+
+    def __init__(self, language="english"):
+        self._sentence_spans = load_sentence_tokenizer(language).span_tokenize
+
+    def tokenize(self, text):
+        """
+        Function to split text into word tokens.
+
+        Non-alphanumeric tokens may differ from word_tokenize's; callers
+        filter them out.
+        """
+        sentences = []
+        for start, end in self._sentence_spans(text):
+            sentence = text[start:end]
+            body = sentence.rstrip().rstrip(self.CLOSERS)
+            if body.endswith(".") and not body.endswith(".."):
+                # Treebank splits the sentence-final period and whatever closes it
+                sentence = body[:-1]
+            sentences.append(sentence)
+        text = self.SPLIT_PATTERN.sub(" ", " ".join(sentences))
+
+        if "'" in text:
+            text = self.LEADING_QUOTE_PATTERN.sub(" ", text)
+        if ":" in text or "," in text:
+            text = self.SEPARATOR_PATTERN.sub(r" \1", text).rstrip(":,")
+        if "'" in text:
+            for pattern in self.CLITIC_PATTERNS:
+                text = pattern.sub(" ", text)
+        if any(contraction in text for contraction in self.CONTRACTIONS):
+            text = self.CONTRACTION_PATTERN.sub(self._split_contraction, text)
+        return text.split()
+
+    @staticmethod
+    def _split_contraction(match):
+        return " " + " ".join(part for part in match.groups() if part) + " "
+
+
+class Preprocessor:
+    """
+    Reusable text preprocessor with compiled patterns, one stopword set and a lemma memo.
+
+    tokens() gives the same output as cleaning, tokenizing, filtering and
+    lemmatizing a text from scratch, but the NLTK resources are loaded once
+    and repeated words are lemmatized only the first time they are seen.
+    analyze() runs tokens() over each section and the text between them, so
+    where the tokenizer would have read across a heading its output can
+    differ slightly from preprocessing the whole text at once. With a
+    LemmaTable, WordNet is only asked about words no process has seen
+    before. The tokenizer is NLTK's word_tokenize ("nltk") or the
+    equivalent FastTokenizer ("fast").
+    """
+
+    PAGE_NUMBER_PATTERN = re.compile(r"(page\s+\d+\s+of\s+\d+|page\s+\d+)", re.IGNORECASE)
+    CONTINUED_PATTERN = re.compile(r"(\n\s*continued\s*\n)", re.IGNORECASE)
+    WHITESPACE_PATTERN = re.compile(r"\s{2,}")
+
+    def __init__(self, lemma_cache_size=LEMMA_CACHE_SIZE, tokenizer="nltk", lemma_table=None):
+        if tokenizer not in TOKENIZERS:
+            raise ValueError(f"Unknown tokenizer {tokenizer!r}; expected one of {', '.join(TOKENIZERS)}")
+        from nltk.corpus import stopwords
+        from nltk.tokenize import word_tokenize
+        from nltk.stem import WordNetLemmatizer
+
+        self.tokenizer = tokenizer
+        self.tokenize = FastTokenizer().tokenize if tokenizer == "fast" else word_tokenize
+        self.stop_words = frozenset(stopwords.words("english"))
+        self.lemmatizer = WordNetLemmatizer()
+        self.lemma_table = lemma_table
+        lemmatize = self._lemmatize if lemma_table is not None else self.lemmatizer.lemmatize
+        self.lemmatize = functools.lru_cache(maxsize=lemma_cache_size)(lemmatize)
+
+    def _lemmatize(self, word):
+        lemma = self.lemma_table.lookup(word)
+        if lemma is None:
+            lemma = self.lemmatizer.lemmatize(word)
+            self.lemma_table.add(word, lemma)
+        return lemma
+
+    def clean(self, raw_text):
+        """
+        Function to strip page markers and collapse whitespace.
+        """
+        cleaned_text = self.PAGE_NUMBER_PATTERN.sub("", raw_text)
+        cleaned_text = self.CONTINUED_PATTERN.sub("", cleaned_text)
+        return self.WHITESPACE_PATTERN.sub(" ", cleaned_text).strip()
+
+    def tokens(self, raw_text):
+        """
+        Function to get the filtered, lemmatized tokens of a text.
+        """
+        if not raw_text:
+            return []
+        stop_words = self.stop_words
+        lemmatize = self.lemmatize
+        return [lemmatize(w) for w in self.tokenize(self.clean(raw_text).lower()) if w.isalnum() and w not in stop_words]
+
+    def analyze(self, raw_text):
+        """
+        Function to analyze a text once into the record every downstream step reuses.
+
+        Returns {"tokens": [...], "sections": {name: [[start, end], ...]}},
+        where each section's spans index into tokens, one span per heading it
+        was written under. Each section is tokenized on its own, so no
+        sentence runs across a section boundary.
+        """
+        tokens, sections = [], {}
+        position = 0
+        for name, start, end in find_sections(raw_text):
+            tokens += self.tokens(raw_text[position:start])
+            section_start = len(tokens)
+            tokens += self.tokens(raw_text[start:end])
+            sections.setdefault(name, []).append([section_start, len(tokens)])
+            position = end
+        tokens += self.tokens(raw_text[position:])
+        return {"tokens": tokens, "sections": sections}
+
+    def __call__(self, raw_text):
+        return " ".join(self.analyze(raw_text)["tokens"])
+
+
+def get_preprocessor(tokenizer=None):
+    """
+    Function to get this process's shared Preprocessor for a tokenizer, loading NLTK resources on first use.
+    """
+    tokenizer = tokenizer or DEFAULT_TOKENIZER
+    preprocessor = _preprocessors.get(tokenizer)
+    if preprocessor is None:
+        with _preprocessor_lock:
+            preprocessor = _preprocessors.get(tokenizer)
+            if preprocessor is None:
+                preprocessor = _preprocessors[tokenizer] = Preprocessor(tokenizer=tokenizer, lemma_table=_open_lemma_table())
+    return preprocessor
+
+
+def missing_nltk_resources(language="english"):
+    """
+    Function to list the NLTK data packages preprocessing needs that are not installed.
+    """
+    import nltk
+
+    try:
+        from nltk.tokenize.punkt import PunktTokenizer  # noqa: F401
+        punkt = (f"tokenizers/punkt_tab/{language}/", "punkt_tab")
+    except ImportError:
+        punkt = (f"tokenizers/punkt/{language}.pickle", "punkt")
+    missing = []
+    for resource, package in (("corpora/stopwords", "stopwords"), ("corpora/wordnet", "wordnet"), punkt):
+        try:
+            nltk.data.find(resource)
+        except LookupError:
+            missing.append(package)
+    return missing
+
+
+def warm_up():
+    """
+    Function to load everything extraction and preprocessing use, so the first resume does not pay for it.
+
+    NLTK's corpus loaders are not safe to trigger from two threads at once,
+    so callers should let this finish before preprocessing concurrently.
+    Raises LookupError naming the missing packages when NLTK data is not installed.
+    """
+    missing = missing_nltk_resources()
+    if missing:
+        raise LookupError(
+            f"Missing NLTK data: {', '.join(missing)}. Install it with `python -m nltk.downloader {' '.join(missing)}`."
+        )
+    import pdfplumber  # noqa: F401
+
+    for tokenizer in TOKENIZERS:
+        preprocessor = get_preprocessor(tokenizer)
+        preprocessor.tokenize("Warm up the sentence tokenizer. It loads on first use.")
+    # WordNet loads on the first lemma lookup
+    preprocessor.lemmatizer.lemmatize("resumes")
+    # Compiles the skills dictionary the first time it changes, then loads the compiled copy
+    skill_matcher.get_matcher()
+
+
+def _open_lemma_table():
+    # Called with _preprocessor_lock held; without a writable cache dir, lemmas stay in memory
+    global _lemma_table
+    if _lemma_table is None:
+        import nltk
+        try:
+            _lemma_table = LemmaTable(version=f"{nltk.__version__}/{_wordnet_fingerprint()}")
+        except (OSError, sqlite3.Error):
+            return None
+    return _lemma_table
+
+
+def _wordnet_fingerprint():
+    # A digest of WordNet's sense index, read without loading WordNet itself
+    import nltk
+    try:
+        with nltk.data.find("corpora/wordnet/index.sense").open() as f:
+            return hashlib.sha256(f.read()).hexdigest()[:16]
+    except LookupError:
+        return "missing"
+
+
+def _heading_key(text):
+    # "WORK EXPERIENCE", "Work Experience:" and "Licenses & Certifications" become the table's keys
+    return " ".join(HEADING_NOISE_PATTERN.sub(" ", text.lower()).split())
+
+
+_HEADING_KEYS = {_heading_key(heading): name for heading, name in SECTION_HEADINGS.items()}
+
+
+def _match_heading(line):
+    # Returns (section, offset of the section's text within the line) for a heading line, else None
+    stripped = line.strip()
+    colon = stripped.find(":", 0, HEADING_MAX_CHARS + 1)
+    if colon > 0:
+        # "Skills: Python, SQL" starts the section on the heading's own line, in any case
+        key = _heading_key(stripped[:colon])
+        if key in _HEADING_KEYS:
+            # "Languages: Python, Java" is a label inside the current section, not the start of an ignored one
+            if _HEADING_KEYS[key] is None and stripped[colon + 1:].strip():
+                return None
+            return _HEADING_KEYS[key], line.index(":") + 1
+    elif stripped and len(stripped) <= HEADING_MAX_CHARS and not stripped[0].islower():
+        # A bare heading must not start lowercase, so a wrapped line reading "skills" stays body text
+        key = _heading_key(stripped)
+        if key in _HEADING_KEYS:
+            return _HEADING_KEYS[key], len(line)
+    return None
+
+
+def find_sections(raw_text):
+    """
+    Function to split text into resume sections as (name, start, end) character spans, in text order.
+
+    One pass over the lines: a heading is a short line that, ignoring case
+    and punctuation, is one of SECTION_HEADINGS ("WORK EXPERIENCE",
+    "Education:"), or a line that starts with one and a colon ("Skills:
+    Python, SQL"). Each section runs from its heading to the next heading of
+    any kind, so "Projects" or "References" end it too; a labelled line such
+    as "Languages: Python, Java" inside a section does not. A section
+    written under several headings yields one span per heading.
+    """
+    sections = []
+    current, start, position = None, 0, 0
+    for line in raw_text.splitlines(keepends=True):
+        heading = _match_heading(line)
+        if heading is not None:
+            if current is not None:
+                sections.append((current, start, position))
+            current, start = heading[0], position + heading[1]
+        position += len(line)
+    if current is not None:
+        sections.append((current, start, position))
+    return [(name, start, end) for name, start, end in sections if name is not None]
+
+
+def analyze(raw_text, tokenizer=None):
+    """
+    Function to tokenize, filter and lemmatize text once into an analysis record.
+    """
+    if not raw_text:
+        return {"tokens": [], "sections": {}}
+    return get_preprocessor(tokenizer).analyze(raw_text)
+
+
+def section_tokens(analysis, name):
+    """
+    Function to get the tokens of one section of an analysis record, or [] if it has none.
+    """
+    tokens = analysis["tokens"]
+    return [token for start, end in analysis["sections"].get(name, ()) for token in tokens[start:end]]
+
+
+def preprocess(raw_text, tokenizer=None):
+    """
+    Function to clean, tokenize, remove stopwords from and lemmatize text.
+    """
+    if not raw_text:
+        return ""
+    return get_preprocessor(tokenizer)(raw_text)
+
+
+def find_skills(raw_text):
+    """
+    Function to find skills-dictionary mentions in raw text as [name, start, end] spans, or [] without a dictionary.
+    """
+    matcher = skill_matcher.get_matcher()
+    return matcher.find(raw_text) if matcher is not None and raw_text else []
+
+
+def basic_clean(raw_text):
+    """
+    Function to clean text without NLTK, used when preprocessing fails.
+    """
+    cleaned_text = re.sub(r"[^a-zA-Z\s]", "", raw_text.lower())
+    return " ".join(cleaned_text.split())
+
+
+def basic_analysis(raw_text):
+    """
+    Function to build an analysis record without NLTK, used when preprocessing fails.
+    """
+    return {"tokens": basic_clean(raw_text).split(), "sections": {}}
+
+
+def content_hash(data):
+    """
+    Function to compute the SHA-256 hex digest that identifies an upload by content.
+    """
+    return hashlib.sha256(data).hexdigest()
+
+
+def process_resume(index, name, data, tokenizer=None):
+    """
+    Function to extract and preprocess a single uploaded resume.
+
+    Runs inside worker processes, so errors are returned as messages
+    instead of being reported through Streamlit.
+    """
+    result = {"index": index, "name": name, "raw_text": "", "processed_text": "", "analysis": basic_analysis(""), "skills": [], "errors": []}
+
+    try:
+        result["raw_text"] = extract_text(data)
+    except Exception as e:
+        result["errors"].append(f"Error extracting text from PDF: {str(e)}")
+        return result
+
+    if result["raw_text"]:
+        try:
+            result["analysis"] = analyze(result["raw_text"], tokenizer)
+        except Exception as e:
+            result["errors"].append(f"Error preprocessing text: {str(e)}")
+            result["analysis"] = basic_analysis(result["raw_text"])
+        result["processed_text"] = " ".join(result["analysis"]["tokens"])
+        # Skills are matched on the raw text, so multi-word names survive tokenization
+        result["skills"] = find_skills(result["raw_text"])
+
+    return result
+
+
+def get_process_pool(max_workers=None):
+    """
+    Function to get the shared process pool, resizing it if needed.
+
+    A worker that dies (a crash on a malformed PDF, an OOM kill) breaks the
+    whole pool, so a broken pool is replaced by a fresh one.
+    """
+    global _process_pool, _process_pool_workers
+
+    max_workers = max_workers or os.cpu_count() or 1
+    with _process_pool_lock:
+        if _process_pool is None or _process_pool_workers != max_workers or _process_pool._broken:
+            if _process_pool is not None:
+                _process_pool.shutdown(wait=False, cancel_futures=True)
+            # Spawn avoids forking the multi-threaded Streamlit server; spawned
+            # workers start cold, so each warms up before taking its first job
+            _process_pool = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_warm_up_worker,
+            )
+            _process_pool_workers = max_workers
+        return _process_pool
+
+
+def submit_to_pool(func, *args, max_workers=None):
+    """
+    Function to submit a job to the shared process pool, replacing the pool once if it turns out to be broken.
+
+    Raises BrokenProcessPool if the fresh pool breaks too.
+    """
+    try:
+        return get_process_pool(max_workers).submit(func, *args)
+    except BrokenProcessPool:
+        return get_process_pool(max_workers).submit(func, *args)
+
+
+def _warm_up_worker():
+    # An initializer that raises breaks the whole pool, so missing NLTK data is left for the jobs to report
+    try:
+        warm_up()
+    except Exception:
+        pass
+
+
+def warm_up_workers(max_workers=None):
+    """
+    Function to start every worker of the shared process pool and wait until they have warmed up.
+
+    Workers are started on demand, so without this the first upload pays
+    for spawning them and for their imports and data loading.
+    """
+    pool = get_process_pool(max_workers)
+    # While no worker is idle, each submit starts another one, which runs the warm-up before its first job
+    for future in [pool.submit(os.getpid) for _ in range(pool._max_workers)]:
+        future.result()
+
+
+def process_resumes(named_files, parallel=False, max_workers=None, cache=None, tokenizer=None):
+    """
+    Function to process (name, bytes) pairs, yielding results as they complete.
+
+    With parallel enabled, extraction and preprocessing run in a process
+    pool and results arrive in completion order; each result carries the
+    original upload position in "index", its content hash in "sha256" and
+    its analysis record (tokens and section spans) in "analysis".
+    When a TextCache is given, cached
+    uploads skip pdfplumber and NLTK entirely and new results are stored.
+    """
+    tokenizer = tokenizer or DEFAULT_TOKENIZER
+    pending = []
+    digests = []
+    for i, (name, data) in enumerate(named_files):
+        digests.append(content_hash(data))
+        key = cache.make_key(digests[i], tokenizer) if cache is not None else None
+        cached = cache.get(key) if key is not None else None
+        if cached is not None:
+            yield _cached_result(i, name, digests[i], cached)
+        else:
+            pending.append((i, name, data, key))
+
+    for result, key in _run_pending(pending, parallel, max_workers, tokenizer):
+        result["sha256"] = digests[result["index"]]
+        result["cached"] = False
+        _store_result(cache, key, result)
+        yield result
+    # Lemmas this process found during the batch; workers flush theirs by size, age and at exit
+    if _lemma_table is not None:
+        _lemma_table.flush()
+
+
+def _cached_result(index, name, digest, cached):
+    raw_text, processed_text, sections = cached
+    analysis = {"tokens": processed_text.split(), "sections": sections}
+    # Skill hits are not cached, so a changed skills dictionary applies to stored resumes too
+    return {"index": index, "name": name, "raw_text": raw_text, "processed_text": processed_text, "analysis": analysis, "skills": find_skills(raw_text), "errors": [], "sha256": digest, "cached": True}
+
+
+def _store_result(cache, key, result):
+    if key is not None and result["raw_text"] and not result["errors"]:
+        cache.put(key, result["raw_text"], result["processed_text"], result["analysis"]["sections"])
+
+
+def _crash_result(index, name, error):
+    # Worker crashed, could not unpickle the result, or the job was cancelled
+    return {"index": index, "name": name, "raw_text": "", "processed_text": "", "analysis": basic_analysis(""), "skills": [], "errors": [str(error)]}
+
+
+def _run_pending(pending, parallel, max_workers, tokenizer):
+    if not parallel or len(pending) < 2:
+        for i, name, data, key in pending:
+            yield process_resume(i, name, data, tokenizer), key
+        return
+
+    futures = {}
+    for i, name, data, key in pending:
+        try:
+            futures[submit_to_pool(process_resume, i, name, data, tokenizer, max_workers=max_workers)] = (i, name, key)
+        except BrokenProcessPool as e:
+            yield _crash_result(i, name, e), None
+    for future in as_completed(futures):
+        i, name, key = futures[future]
+        try:
+            yield future.result(), key
+        except Exception as e:
+            yield _crash_result(i, name, e), None
+
+
+def get_background_threads():
+    """
+    Function to get the shared single-thread executor for background extraction.
+    """
+    global _background_threads
+
+    with _background_lock:
+        if _background_threads is None:
+            _background_threads = ThreadPoolExecutor(max_workers=1, thread_name_prefix="extract")
+        return _background_threads
+
+
+def _run_when_ready(ready, func, *args):
+    # NLTK's lazy corpus loaders must finish loading before a second thread uses them
+    if ready is not None:
+        ready()
+    return func(*args)
+
+
+class BackgroundExtractor:
+    """
+    Extracts and preprocesses uploads in the background as soon as they arrive.
+
+    sync() is called with the current uploads on every rerun: uploads not seen
+    before are served from the text cache or queued, on the shared process
+    pool when parallel is set and on a background thread otherwise. Queued
+    jobs for uploads that were removed are cancelled; a job already running
+    is left to finish and its result dropped. Results are kept by content
+    hash, so a re-added or renamed file is never processed twice.
+    """
+
+    def __init__(self, tokenizer=None, parallel=False, cache=None, ready=None):
+        self.tokenizer = tokenizer or DEFAULT_TOKENIZER
+        self.parallel = parallel
+        self.cache = cache
+        self.ready = ready
+        self.jobs = {}
+        self._lock = threading.Lock()
+
+    def sync(self, named_files, digests=None, retry_failed=False):
+        """
+        Function to start jobs for new uploads and cancel jobs for removed ones, returning the uploads' digests.
+
+        With retry_failed set, uploads whose job failed are submitted again.
+        """
+        if digests is None:
+            digests = [content_hash(data) for _, data in named_files]
+        with self._lock:
+            for digest, (name, data) in zip(digests, named_files):
+                if digest not in self.jobs or (retry_failed and self.status(digest) == "failed"):
+                    self.jobs[digest] = (name, self._submit(digest, name, data))
+            for digest in set(self.jobs).difference(digests):
+                self.jobs.pop(digest)[1].cancel()
+        return digests
+
+    def _submit(self, digest, name, data):
+        key = self.cache.make_key(digest, self.tokenizer) if self.cache is not None else None
+        cached = self.cache.get(key) if key is not None else None
+        if cached is not None:
+            future = Future()
+            future.set_result(_cached_result(0, name, digest, cached))
+            return future
+
+        if self.parallel:
+            try:
+                future = submit_to_pool(process_resume, 0, name, data, self.tokenizer)
+            except BrokenProcessPool as e:
+                # Reported as a failed job, so the page keeps working and the upload is retried with the next results
+                future = Future()
+                future.set_exception(e)
+                return future
+        else:
+            future = get_background_threads().submit(_run_when_ready, self.ready, process_resume, 0, name, data, self.tokenizer)
+        future.add_done_callback(functools.partial(self._finish, digest, key))
+        return future
+
+    def _finish(self, digest, key, future):
+        if future.cancelled() or future.exception() is not None:
+            return
+        result = future.result()
+        result["sha256"] = digest
+        result["cached"] = False
+        _store_result(self.cache, key, result)
+
+    def status(self, digest):
+        """
+        Function to describe an upload's job: "queued", "processing", "ready", "failed" or "removed".
+        """
+        job = self.jobs.get(digest)
+        if job is None:
+            return "removed"
+        future = job[1]
+        if not future.done():
+            return "processing" if future.running() else "queued"
+        # Preprocessing errors fall back to basic cleaning; only a failed extraction leaves no text
+        if future.cancelled() or future.exception() is not None or (future.result()["errors"] and not future.result()["processed_text"]):
+            return "failed"
+        return "ready"
+
+    def pending(self, digests):
+        """
+        Function to count the given uploads whose job has not finished yet.
+        """
+        return sum(not self.jobs[digest][1].done() for digest in set(digests) if digest in self.jobs)
+
+    def cancel(self):
+        """
+        Function to cancel every queued job and forget all results.
+        """
+        with self._lock:
+            for _, future in self.jobs.values():
+                future.cancel()
+            self.jobs = {}
+
+    def results(self, digests):
+        """
+        Function to yield (digest, result) for the given uploads as their jobs complete.
+        """
+        futures = {self.jobs[digest][1]: digest for digest in dict.fromkeys(digests) if digest in self.jobs}
+        for future in as_completed(futures):
+            digest = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = _crash_result(0, self.jobs.get(digest, (digest,))[0], e)
+            result["sha256"] = digest
+            yield digest, result
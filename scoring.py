@@ -0,0 +1,627 @@
+import os
+import sys
+import time
+import hashlib
+import argparse
+import functools
+import threading
+
+import numpy as np
+import scipy.sparse as sp
+
+import resume_processing
+
+# scikit-learn and joblib take over a second to import, so they are imported
+# by the functions that use them; importing this module stays cheap for the UI
+
+DEFAULT_MODEL_PATH = os.environ.get(
+    "RESUME_IDF_MODEL",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "models", "tfidf_model.joblib"),
+)
+
+
+def ngram_features(document, ngram_range=(1, 2)):
+    """
+    Function to turn an analyzed token list (or a space-joined processed text) into n-gram features.
+
+    Gives the same features as the default word analyzer on processed text,
+    which drops single-character tokens, without tokenizing the text again.
+    """
+    if isinstance(document, str):
+        document = document.split()
+    tokens = [token for token in document if len(token) > 1]
+    min_n, max_n = ngram_range
+    features = list(tokens) if min_n == 1 else []
+    for n in range(max(min_n, 2), max_n + 1):
+        features += [" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1)]
+    return features
+
+
+def make_vectorizer():
+    """
+    Function to create the TF-IDF vectorizer used for resume scoring.
+
+    Documents are analysis token lists (processed strings also work), so
+    the vectorizer never tokenizes text itself.
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    return TfidfVectorizer(max_features=1000, analyzer=ngram_features)
+
+
+def warm_up():
+    """
+    Function to import scikit-learn and score one tiny batch, so the first real scoring does not pay for it.
+    """
+    from sklearn.metrics.pairwise import cosine_similarity
+
+    matrix = make_vectorizer().fit_transform([["warm", "up"], ["warm", "start"]])
+    cosine_similarity(matrix[:1], matrix[1:])
+    HashingEngine(n_features=2 ** 10).fit_transform([["warm", "up"]])
+
+
+def upgrade_vectorizer(vectorizer):
+    """
+    Function to switch a vectorizer fitted with the word analyzer over to pre-analyzed tokens.
+    """
+    if vectorizer.analyzer == "word":
+        vectorizer.analyzer = functools.partial(ngram_features, ngram_range=vectorizer.ngram_range)
+        vectorizer.ngram_range = (1, 1)
+    return vectorizer
+
+
+class DocumentFrequency:
+    """
+    Mergeable document-frequency counts over hashed features.
+
+    Each worker can count its own share of documents; merging the counters
+    gives the same IDF weights as counting the whole batch in one place.
+    """
+
+    def __init__(self, n_features):
+        self.counts = np.zeros(n_features, dtype=np.int64)
+        self.n_documents = 0
+
+    def update(self, counts):
+        """
+        Function to add the documents of a CSR term-count matrix to the counts.
+        """
+        counts = sp.csr_matrix(counts)
+        counts.sum_duplicates()
+        self.counts += np.bincount(counts.indices, minlength=len(self.counts))
+        self.n_documents += counts.shape[0]
+        return self
+
+    def merge(self, other):
+        """
+        Function to fold another counter over the same feature space into this one.
+        """
+        self.counts += other.counts
+        self.n_documents += other.n_documents
+        return self
+
+    def idf(self):
+        """
+        Function to compute smoothed IDF weights, as TfidfVectorizer does.
+        """
+        return (np.log((1 + self.n_documents) / (1 + self.counts)) + 1).astype(np.float32)
+
+
+class HashingEngine:
+    """
+    Stateless TF-IDF alternative built on feature hashing.
+
+    Documents are mapped to n_features columns without a fitted vocabulary,
+    so any process can vectorize any resume independently; IDF weighting is
+    applied afterwards from a DocumentFrequency counter.
+    """
+
+    def __init__(self, n_features=2 ** 18, ngram_range=(1, 2)):
+        from sklearn.feature_extraction.text import HashingVectorizer
+
+        self.n_features = n_features
+        self.ngram_range = ngram_range
+        self._vectorizer = HashingVectorizer(
+            n_features=n_features,
+            analyzer=functools.partial(ngram_features, ngram_range=ngram_range),
+            alternate_sign=False,
+            norm=None,
+            dtype=np.float32,
+        )
+
+    def count(self, documents):
+        """
+        Function to hash token lists into a CSR term-count matrix plus their document frequencies.
+        """
+        counts = self._vectorizer.transform(documents)
+        return counts, DocumentFrequency(self.n_features).update(counts)
+
+    def weight(self, counts, document_frequency):
+        """
+        Function to apply IDF weights and L2-normalize hashed term counts.
+        """
+        from sklearn.preprocessing import normalize
+
+        weighted = sp.csr_matrix(counts, dtype=np.float32) @ sp.diags(document_frequency.idf())
+        return normalize(weighted, norm="l2", copy=False)
+
+    def feature_columns(self, document):
+        """
+        Function to map each n-gram feature of a token list to the column it hashes to.
+        """
+        from sklearn.feature_extraction import FeatureHasher
+
+        features = list(dict.fromkeys(ngram_features(document, self.ngram_range)))
+        # HashingVectorizer hashes features with exactly this FeatureHasher
+        hashed = FeatureHasher(self.n_features, input_type="string", alternate_sign=False).transform([[f] for f in features])
+        return dict(zip(features, hashed.indices.tolist()))
+
+    def count_batch(self, documents, parallel=False, max_workers=None, chunk_size=500):
+        """
+        Function to hash a batch into term counts and document frequencies, in worker processes when parallel is set.
+        """
+        if not parallel or len(documents) <= chunk_size:
+            return self.count(documents)
+
+        pool = resume_processing.get_process_pool(max_workers)
+        chunks = [documents[i:i + chunk_size] for i in range(0, len(documents), chunk_size)]
+        futures = [pool.submit(hash_documents, self.n_features, self.ngram_range, chunk) for chunk in chunks]
+        blocks = []
+        document_frequency = DocumentFrequency(self.n_features)
+        for future in futures:
+            counts, chunk_frequency = future.result()
+            blocks.append(counts)
+            document_frequency.merge(chunk_frequency)
+        return sp.vstack(blocks, format="csr"), document_frequency
+
+    def fit_transform(self, documents, parallel=False, max_workers=None, chunk_size=500):
+        """
+        Function to vectorize a batch, hashing chunks in worker processes when parallel is set.
+        """
+        return self.weight(*self.count_batch(documents, parallel, max_workers, chunk_size))
+
+
+class VectorCache:
+    """
+    Per-resume vectors kept between runs, keyed by content hash.
+
+    A resume's row from a pre-fitted model, like its hashed term counts,
+    depends on nothing but the resume, so when the uploads change only the
+    new resumes are vectorized and the rows of removed ones are dropped.
+    The rows are kept as one stacked block in the order last asked for, so
+    a run over the same resumes gets the block back without restacking.
+    A cache belongs to one vectorizer setting, named by its key.
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self.keys = None
+        self.block = None
+        self.positions = {}
+        self.last_vectorized = 0
+
+    def __len__(self):
+        return len(self.positions)
+
+    def matrix(self, keys, documents, vectorize):
+        """
+        Function to stack the rows of the given documents, calling vectorize(documents) only for uncached ones.
+        """
+        keys = list(keys)
+        if keys == self.keys:
+            self.last_vectorized = 0
+            return self.block
+
+        missing = {}
+        for key, document in zip(keys, documents):
+            if key not in self.positions:
+                missing.setdefault(key, document)
+        self.last_vectorized = len(missing)
+        if missing:
+            new_block = sp.csr_matrix(vectorize(list(missing.values())))
+            offset = self.block.shape[0] if self.block is not None else 0
+            self.block = new_block if self.block is None else sp.vstack([self.block, new_block], format="csr")
+            self.positions.update((key, offset + i) for i, key in enumerate(missing))
+
+        # Keep only the rows asked for, in their order, so the next identical request is free
+        self.block = self.block[[self.positions[key] for key in keys]]
+        self.keys = keys
+        self.positions = {key: i for i, key in enumerate(keys)}
+        return self.block
+
+
+def query_weights(vectorizer, documents):
+    """
+    Function to get the TF-IDF weights of documents from a fitted TfidfVectorizer before L2 normalization.
+    """
+    from sklearn.feature_extraction.text import CountVectorizer
+
+    weights = CountVectorizer.transform(vectorizer, documents).astype(np.float64)
+    if vectorizer.sublinear_tf:
+        np.log(weights.data, weights.data)
+        weights.data += 1
+    if vectorizer.use_idf:
+        weights = weights @ sp.diags(vectorizer.idf_)
+    return sp.csr_matrix(weights)
+
+
+class IncrementalScores:
+    """
+    Cosine scores of one query against fixed L2-normalized rows, updated by query edits.
+
+    Scores are linear in the query, so the dot products with the unnormalized
+    query weights are kept; an edited query only adds its changed weights
+    times the matching posting columns, and dividing by the new query norm
+    renormalizes. Edits that touch more terms than the query holds are
+    scored with one full product instead.
+    """
+
+    def __init__(self, postings, query):
+        self.postings = sp.csc_matrix(postings)
+        self.query = sp.csr_matrix(query)
+        self.dots = np.asarray(self.postings @ self.query.T.toarray()).ravel()
+        self.last_changed = self.query.nnz
+
+    def update(self, query):
+        """
+        Function to rescore for an edited query given as a 1 x n_features weight row.
+        """
+        query = sp.csr_matrix(query)
+        delta = query - self.query
+        delta.eliminate_zeros()
+        if delta.nnz > query.nnz:
+            self.dots = np.asarray(self.postings @ query.T.toarray()).ravel()
+        elif delta.nnz:
+            self.dots += self.postings[:, delta.indices] @ delta.data
+        self.query = query
+        self.last_changed = delta.nnz
+        return self
+
+    @property
+    def scores(self):
+        norm = np.sqrt(self.query.multiply(self.query).sum())
+        return self.dots / norm if norm else np.zeros_like(self.dots)
+
+
+class FieldMatrix:
+    """
+    Per-field document vectors side by side in one block matrix, for weighted multi-field scores.
+
+    Each field (the whole document, its skills section, ...) has its own
+    L2-normalized n_documents x n_features matrix, and the matrices are
+    stacked column-wise. A query repeated once per field and scaled by the
+    field's share of the total weight then scores every document against
+    every field in one sparse product: sum_f w_f * cos(q, d_f) / sum_f w_f.
+    Changing the weights only rebuilds the query blocks, so nothing is
+    vectorized again.
+    """
+
+    def __init__(self, fields, matrices):
+        self.fields = tuple(fields)
+        self.n_features = matrices[0].shape[1]
+        self.matrix = sp.hstack(matrices, format="csr")
+
+    def queries(self, queries, weights):
+        """
+        Function to expand L2-normalized query rows into block queries for {field: weight}.
+        """
+        queries = sp.csr_matrix(queries)
+        shares = np.asarray([max(weights.get(field, 0.0), 0.0) for field in self.fields], dtype=float)
+        if shares.sum() > 0:
+            shares /= shares.sum()
+        empty = sp.csr_matrix(queries.shape, dtype=queries.dtype)
+        return sp.hstack([queries * share if share else empty for share in shares], format="csr")
+
+    def scores(self, queries, weights):
+        """
+        Function to score every document for each L2-normalized query row, one row of scores per query.
+        """
+        return np.asarray((self.matrix @ self.queries(queries, weights).T).toarray()).T
+
+
+def feature_names(vectorizer, document):
+    """
+    Function to name the feature columns of a document's n-grams for a fitted TF-IDF vectorizer or a HashingEngine.
+
+    Hashed columns can only be named from features that are known to occur,
+    so only the document's own features are named; that covers every column
+    a query built from the document can contribute to.
+    """
+    if isinstance(vectorizer, HashingEngine):
+        columns = vectorizer.feature_columns(document)
+    else:
+        columns = {f: vectorizer.vocabulary_[f] for f in ngram_features(document) if f in vectorizer.vocabulary_}
+    names = {}
+    for feature, column in columns.items():
+        # On a hash collision the first feature keeps the column
+        names.setdefault(column, feature)
+    return names
+
+
+def top_contributions(query, matrix, top_n=15, chunk_size=2 ** 22):
+    """
+    Function to find, for every row of matrix, the columns that add most to its dot product with query.
+
+    Contributions are the elementwise products of the query with each row,
+    so for L2-normalized vectors they sum to the cosine score. Only the
+    query's own columns can contribute, so they are gathered into a dense
+    rows x query-terms block (chunk_size cells at a time) and every row is
+    ranked at once with argpartition. Returns (indptr, columns,
+    contributions), with row i's best columns first in
+    columns[indptr[i]:indptr[i + 1]]; ties keep the lower column first.
+    """
+    query = sp.csr_matrix(query)
+    query.sort_indices()
+    columns, n_rows = query.indices, matrix.shape[0]
+    keep = min(top_n, len(columns))
+    if keep == 0:
+        return np.zeros(n_rows + 1, dtype=np.int64), columns[:0], query.data[:0]
+
+    block = sp.csr_matrix(matrix[:, columns] @ sp.diags(query.data))
+    picked_blocks, weight_blocks = [], []
+    rows_per_chunk = max(1, chunk_size // len(columns))
+    for start in range(0, n_rows, rows_per_chunk):
+        dense = block[start:start + rows_per_chunk].toarray()
+        if len(columns) > 4 * keep:
+            # Long queries: select each row's best terms first, then order only those.
+            # Terms tied with the kth best are taken lowest column first, as the full sort would.
+            kth = -np.partition(-dense, keep - 1, axis=1)[:, keep - 1:keep]
+            above, tied = dense > kth, dense == kth
+            selected = above | (tied & (np.cumsum(tied, axis=1) <= keep - above.sum(axis=1, keepdims=True)))
+            picked = np.nonzero(selected)[1].reshape(-1, keep)
+            order = np.argsort(-np.take_along_axis(dense, picked, axis=1), axis=1, kind="stable")
+            picked = np.take_along_axis(picked, order, axis=1)
+        else:
+            picked = np.argsort(-dense, axis=1, kind="stable")[:, :keep]
+        picked_blocks.append(picked)
+        weight_blocks.append(np.take_along_axis(dense, picked, axis=1))
+
+    picked, weights = np.vstack(picked_blocks), np.vstack(weight_blocks)
+    # Terms a row does not contain contribute nothing and are dropped
+    matched = weights > 0
+    indptr = np.concatenate([[0], np.cumsum(matched.sum(axis=1))])
+    return indptr, columns[picked[matched]], weights[matched]
+
+
+def hash_documents(n_features, ngram_range, documents):
+    """
+    Function to hash one chunk of documents; runs in worker processes.
+    """
+    return HashingEngine(n_features, ngram_range).count(documents)
+
+
+def fit_corpus_model(documents):
+    """
+    Function to fit the vocabulary and IDF weights once on a historical corpus.
+
+    Returns a model bundle holding the fitted vectorizer and a version string
+    derived from its vocabulary, so caches can tell models apart.
+    """
+    vectorizer = make_vectorizer()
+    vectorizer.fit(documents)
+    digest = hashlib.sha256()
+    for term in sorted(vectorizer.vocabulary_):
+        digest.update(term.encode("utf-8") + b"\0")
+    digest.update(vectorizer.idf_.tobytes())
+    return {
+        "vectorizer": vectorizer,
+        "version": digest.hexdigest()[:16],
+        "n_documents": len(documents),
+        "fitted_at": time.time(),
+    }
+
+
+def save_model(model, path=DEFAULT_MODEL_PATH):
+    """
+    Function to persist a model bundle atomically, so running apps never read a partial file.
+    """
+    import joblib
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    joblib.dump(model, tmp_path)
+    os.replace(tmp_path, path)
+
+
+class ModelStore:
+    """
+    Loads the persisted corpus model and reloads it when the file is replaced.
+
+    Models can be rebuilt offline and hot-swapped by overwriting the model
+    file; the next call to get() picks up the new version without a restart.
+    """
+
+    def __init__(self, path=DEFAULT_MODEL_PATH):
+        self.path = path
+        self._model = None
+        self._mtime = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        """
+        Function to return the current model bundle, or None if no model has been built.
+        """
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            if mtime != self._mtime:
+                import joblib
+                self._model = joblib.load(self.path)
+                upgrade_vectorizer(self._model["vectorizer"])
+                self._mtime = mtime
+            return self._model
+
+
+def top_k_indices(scores, k):
+    """
+    Function to select the k best scores, best first, without sorting the rest.
+
+    Ties are broken by lower index, which is the order a stable full sort
+    of (index, score) pairs would give.
+    """
+    scores = np.asarray(scores)
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    kth = np.partition(scores, len(scores) - k)[len(scores) - k]
+    above = np.flatnonzero(scores > kth)
+    ties = np.flatnonzero(scores == kth)[:k - len(above)]
+    top = np.concatenate([above, ties])
+    return top[np.lexsort((top, -scores[top]))]
+
+
+class RankedResults:
+    """
+    Scores for a batch of resumes, ranked lazily one page at a time.
+
+    Nothing is sorted up front: the first request selects the top ranks with
+    argpartition, and later pages extend the ranked prefix only when they are
+    asked for. Ties keep upload order, as a stable full sort would.
+    """
+
+    def __init__(self, scores):
+        self.scores = np.asarray(scores)
+        self._order = np.empty(0, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.scores)
+
+    def top(self, k):
+        """
+        Function to get the indices and scores of the k best resumes, best first.
+        """
+        k = min(k, len(self.scores))
+        if k > len(self._order):
+            # Grow the ranked prefix geometrically so paging forward stays cheap
+            self._order = top_k_indices(self.scores, max(k, 2 * len(self._order)))
+        order = self._order[:k]
+        return order, self.scores[order]
+
+    def page(self, number, page_size):
+        """
+        Function to get the indices and scores ranked on a zero-based page.
+        """
+        start = number * page_size
+        order, scores = self.top(start + page_size)
+        return order[start:], scores[start:]
+
+    def page_count(self, page_size):
+        return max(1, -(-len(self.scores) // page_size))
+
+
+class InvertedIndex:
+    """
+    Term-major postings of an L2-normalized document matrix with per-term score upper bounds.
+
+    top_k() uses MaxScore: posting lists are read in decreasing order of
+    their best possible contribution, in batches that double in size, and
+    once the lists left over cannot lift an unseen document past the current
+    k-th best partial score, only the documents that can still make the top
+    k are rescored exactly from their rows. Each batch is one sparse product
+    over its columns, so the cost follows the postings read rather than the
+    number of terms. Results are identical to scoring every document and sorting.
+    """
+
+    # Slack for float32 accumulation order when comparing against the threshold
+    EPSILON = 1e-5
+
+    def __init__(self, matrix, postings=None, term_max=None):
+        self.matrix = sp.csr_matrix(matrix, copy=False)
+        self.postings = sp.csc_matrix(self.matrix) if postings is None else postings
+        if term_max is None:
+            if self.postings.shape[0] == 0:
+                # An empty pool (nothing readable, or everyone deleted) has no weights to bound
+                term_max = np.zeros(self.postings.shape[1])
+            else:
+                term_max = np.asarray(self.postings.max(axis=0).toarray()).ravel()
+        self.term_max = np.asarray(term_max, dtype=np.float32)
+
+    def top_k(self, query, k, threshold=0.0, excluded=None):
+        """
+        Function to return (rows, scores) of the k best documents for a dense query vector.
+
+        Documents scoring below threshold, and rows in excluded, are never returned.
+        """
+        n_docs = self.matrix.shape[0]
+        query = np.asarray(query, dtype=np.float32).ravel()
+        if k <= 0 or n_docs == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        terms = np.flatnonzero(query)
+        bounds = query[terms] * self.term_max[terms]
+        order = np.argsort(-bounds, kind="stable")
+        terms, bounds = terms[order], bounds[order]
+        # remaining[i] is the most that posting lists i.. can add to any document
+        remaining = np.append(np.cumsum(bounds[::-1])[::-1], 0.0)
+
+        acc = np.zeros(n_docs, dtype=np.float32)
+        if excluded is not None and len(excluded):
+            acc[np.asarray(excluded, dtype=np.int64)] = -np.inf
+
+        theta = threshold
+        essential, batch = 0, 1
+        while essential < len(terms) and remaining[essential] >= theta - self.EPSILON:
+            block = terms[essential:essential + batch]
+            acc += self.postings[:, block].dot(query[block])
+            essential += len(block)
+            batch *= 2
+            # Partial scores never exceed exact ones, so the k-th best partial is a safe threshold
+            above = acc[acc > theta]
+            if len(above) >= k:
+                theta = float(np.partition(above, len(above) - k)[len(above) - k])
+
+        touched = acc > 0 if essential == len(terms) else np.isfinite(acc)
+        candidates = np.flatnonzero(touched & (acc + remaining[essential] >= theta - self.EPSILON))
+        scores = np.asarray(self.matrix[candidates].dot(query), dtype=np.float32).ravel()
+
+        if len(candidates) < k and threshold <= 0 and essential == len(terms):
+            # Every posting list was read, so untouched live documents score exactly zero
+            unseen = np.flatnonzero(acc == 0)[:k - len(candidates)]
+            candidates = np.concatenate([candidates, unseen])
+            scores = np.concatenate([scores, np.zeros(len(unseen), dtype=np.float32)])
+            order = np.argsort(candidates, kind="stable")
+            candidates, scores = candidates[order], scores[order]
+
+        keep = scores >= threshold
+        candidates, scores = candidates[keep], scores[keep]
+        top = top_k_indices(scores, k)
+        return candidates[top], scores[top]
+
+
+def load_corpus_texts(paths):
+    """
+    Function to read and preprocess historical resumes from PDF or text files.
+    """
+    documents = []
+    for path in paths:
+        try:
+            processed_text = resume_processing.preprocess(resume_processing.read_resume_file(path))
+        except Exception as e:
+            print(f"Skipping {path}: {e}", file=sys.stderr)
+            continue
+        if processed_text:
+            documents.append(processed_text)
+    return documents
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fit the corpus TF-IDF model used for resume scoring.")
+    parser.add_argument("corpus", help="Directory of historical resumes (.pdf or .txt)")
+    parser.add_argument("--output", default=DEFAULT_MODEL_PATH, help="Where to write the model file")
+    args = parser.parse_args(argv)
+
+    documents = load_corpus_texts(resume_processing.find_resume_files(args.corpus))
+    if not documents:
+        parser.error(f"No readable resumes found in {args.corpus}")
+
+    model = fit_corpus_model(documents)
+    save_model(model, args.output)
+    print(f"Fitted model {model['version']} on {len(documents)} resumes -> {args.output}")
+
+
+if __name__ == "__main__":
+    # Run the importable module, so fitted models pickle scoring.ngram_features instead of __main__'s copy
+    import scoring
+    scoring.main()
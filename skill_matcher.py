@@ -0,0 +1,199 @@
+import os
+import re
+import pickle
+import hashlib
+import argparse
+import threading
+from collections import deque
+
+from text_cache import DEFAULT_CACHE_DIR
+
+DEFAULT_SKILLS_PATH = os.environ.get(
+    "RESUME_SKILLS_FILE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "skills.txt"),
+)
+
+# Bump whenever tokenization or the compiled tables change, to invalidate compiled automata on disk
+MATCHER_VERSION = "1"
+
+# Words, keeping the symbols and dotted parts skill names use (c++, c#, node.js), or single punctuation
+# marks; hyphens separate words like whitespace, so "front-end" and "front end" are the same phrase
+TOKEN_PATTERN = re.compile(r"\w[\w+#]*(?:\.\w+)*|[^\w\s-]")
+
+# Per-process matchers, one per skills file, loaded on first use (None when the file is missing)
+_matchers = {}
+_matcher_lock = threading.Lock()
+
+
+def parse_skills(text):
+    """
+    Function to parse a skills dictionary into (name, aliases) pairs.
+
+    Each line holds one skill: its display name, then any aliases, separated
+    by "|". Blank lines and lines starting with "#" are ignored.
+    """
+    skills = []
+    for line in text.splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            name, *aliases = [part.strip() for part in line.split("|")]
+            skills.append((name, [alias for alias in aliases if alias]))
+    return skills
+
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over the word tokens of a skills dictionary.
+
+    Skills are matched as whole token sequences, case-insensitively, so
+    multi-word and symbol-laden names ("machine learning", "ci/cd", "c++")
+    are found while "java" never matches inside "javascript". find() reads
+    each token of a text once, whatever the size of the dictionary. The
+    automaton is plain lists and dicts, so it pickles and loads quickly;
+    see load_matcher() for the compiled copy kept on disk.
+    """
+
+    def __init__(self, names, goto, fail, outputs):
+        self.names = names
+        self.goto = goto
+        self.fail = fail
+        self.outputs = outputs
+
+    @classmethod
+    def compile(cls, skills):
+        """
+        Function to build the automaton for (name, aliases) pairs.
+        """
+        names, goto, outputs = [], [{}], {}
+        for name, aliases in skills:
+            names.append(name)
+            for phrase in [name, *aliases]:
+                words = [token.lower() for token in TOKEN_PATTERN.findall(phrase)]
+                if not words:
+                    continue
+                state = 0
+                for word in words:
+                    following = goto[state].get(word)
+                    if following is None:
+                        following = goto[state][word] = len(goto)
+                        goto.append({})
+                    state = following
+                outputs.setdefault(state, set()).add((len(names) - 1, len(words)))
+
+        # Breadth-first, so a state's failure target is complete before the state itself
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for word, following in goto[state].items():
+                queue.append(following)
+                target = fail[state]
+                while target and word not in goto[target]:
+                    target = fail[target]
+                fail[following] = goto[target].get(word, 0)
+                inherited = outputs.get(fail[following])
+                if inherited:
+                    outputs.setdefault(following, set()).update(inherited)
+
+        # Longest phrase first at each state, so overlapping hits come out in text order
+        outputs = {state: tuple(sorted(hits, key=lambda hit: -hit[1])) for state, hits in outputs.items()}
+        return cls(names, goto, fail, outputs)
+
+    def __len__(self):
+        return len(self.names)
+
+    def find(self, text):
+        """
+        Function to find every skill mention in a text as [name, start, end] character spans.
+
+        Overlapping mentions are all reported ("machine learning" and
+        "learning" when both are skills).
+        """
+        goto, fail, outputs, names = self.goto, self.fail, self.outputs, self.names
+        state = 0
+        starts, hits = [], []
+        for position, match in enumerate(TOKEN_PATTERN.finditer(text)):
+            word = match.group().lower()
+            starts.append(match.start())
+            while state and word not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(word, 0)
+            for skill, length in outputs.get(state, ()):
+                hits.append([names[skill], starts[position - length + 1], match.end()])
+        return hits
+
+    def skills(self, text):
+        """
+        Function to list the distinct skills mentioned in a text, in order of first mention.
+        """
+        return distinct_skills(self.find(text))
+
+
+def distinct_skills(hits):
+    """
+    Function to list the distinct skill names of [name, start, end] hits, in order of first mention.
+    """
+    return list(dict.fromkeys(name for name, _, _ in sorted(hits, key=lambda hit: hit[1])))
+
+
+def load_matcher(path=DEFAULT_SKILLS_PATH, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Function to get the automaton of a skills file, compiling it only when no process has yet.
+
+    Compiled automata are pickled into the cache directory under a hash of
+    the file's contents, so editing the dictionary recompiles it and every
+    other process and restart loads the stored copy.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    digest = hashlib.sha256(MATCHER_VERSION.encode() + b":" + data).hexdigest()[:16]
+    compiled_path = os.path.join(cache_dir, f"skills-{digest}.pickle")
+    try:
+        with open(compiled_path, "rb") as f:
+            return SkillMatcher(*pickle.load(f))
+    except (OSError, EOFError, pickle.UnpicklingError):
+        pass
+
+    matcher = SkillMatcher.compile(parse_skills(data.decode("utf-8")))
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{compiled_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump((matcher.names, matcher.goto, matcher.fail, matcher.outputs), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, compiled_path)
+    except OSError:
+        # Read-only cache dir: keep the compiled automaton in memory only
+        pass
+    return matcher
+
+
+def get_matcher(path=DEFAULT_SKILLS_PATH):
+    """
+    Function to get this process's shared matcher for a skills file, or None if it is missing or unreadable.
+    """
+    if path not in _matchers:
+        with _matcher_lock:
+            if path not in _matchers:
+                try:
+                    _matchers[path] = load_matcher(path)
+                except (OSError, ValueError):
+                    # Skills are optional; screening works the same without them
+                    _matchers[path] = None
+    return _matchers[path]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile a skills dictionary and list the skills found in text files.")
+    parser.add_argument("files", nargs="*", help="Text files to scan for skills")
+    parser.add_argument("--skills", default=DEFAULT_SKILLS_PATH, help="Skills dictionary, one skill per line")
+    args = parser.parse_args(argv)
+
+    matcher = load_matcher(args.skills)
+    print(f"{len(matcher):,} skills, {len(matcher.goto):,} automaton states ({args.skills})")
+    for path in args.files:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            print(f"{path}: {', '.join(matcher.skills(f.read())) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
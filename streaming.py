@@ -0,0 +1,260 @@
+import os
+import sys
+import json
+import argparse
+from itertools import islice
+
+import numpy as np
+import scipy.sparse as sp
+
+import resume_processing
+import scoring
+
+DEFAULT_CHUNK_SIZE = 5000
+
+
+def iter_records(path):
+    """
+    Function to stream {"id", "name", "text"} records from a JSON Lines file.
+    """
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def iter_chunks(iterable, chunk_size):
+    """
+    Function to group an iterable into lists of at most chunk_size items.
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def preprocess_text_file(path):
+    """
+    Function to preprocess a plain-text resume, falling back to basic cleaning like uploads do.
+    """
+    raw_text = resume_processing.read_resume_file(path)
+    try:
+        return resume_processing.preprocess(raw_text)
+    except Exception as e:
+        print(f"{path}: Error preprocessing text: {e}", file=sys.stderr)
+        return resume_processing.basic_clean(raw_text)
+
+
+def iter_processed(paths, parallel=True):
+    """
+    Function to yield (path, processed_text) for resume files, in completion order.
+
+    PDFs are extracted in the process pool; plain-text resumes need no
+    extraction and are preprocessed directly.
+    """
+    named_files = []
+    for path in paths:
+        if path.lower().endswith(".pdf"):
+            with open(path, "rb") as f:
+                named_files.append((path, f.read()))
+        else:
+            yield path, preprocess_text_file(path)
+    for result in resume_processing.process_resumes(named_files, parallel=parallel):
+        for error in result["errors"]:
+            print(f"{result['name']}: {error}", file=sys.stderr)
+        yield result["name"], result["processed_text"]
+
+
+def preprocess_corpus(paths, output_path, chunk_size=500, parallel=True):
+    """
+    Function to extract and preprocess resume files into a JSON Lines file, a chunk at a time.
+    """
+    written = 0
+    with open(output_path, "w", encoding="utf-8") as out:
+        for chunk in iter_chunks(paths, chunk_size):
+            for path, processed_text in iter_processed(chunk, parallel=parallel):
+                if processed_text:
+                    record = {"id": path, "name": os.path.basename(path), "text": processed_text}
+                    out.write(json.dumps(record) + "\n")
+                    written += 1
+    return written
+
+
+def write_block(path, matrix, records):
+    """
+    Function to write one block's CSR matrix and candidate ids to disk.
+    """
+    os.makedirs(path, exist_ok=True)
+    matrix = sp.csr_matrix(matrix, dtype=np.float32)
+    np.save(os.path.join(path, "data.npy"), matrix.data)
+    np.save(os.path.join(path, "indices.npy"), matrix.indices.astype(np.int32))
+    np.save(os.path.join(path, "indptr.npy"), matrix.indptr.astype(np.int64))
+    with open(os.path.join(path, "ids.jsonl"), "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps({"id": record["id"], "name": record["name"]}) + "\n")
+
+
+def read_block(path, n_features):
+    """
+    Function to memory map one block's CSR matrix.
+    """
+    data = np.load(os.path.join(path, "data.npy"), mmap_mode="r")
+    indices = np.load(os.path.join(path, "indices.npy"), mmap_mode="r")
+    indptr = np.load(os.path.join(path, "indptr.npy"), mmap_mode="r")
+    return sp.csr_matrix((data, indices, indptr), shape=(len(indptr) - 1, n_features), copy=False)
+
+
+def read_block_ids(path, rows):
+    """
+    Function to read the candidate metadata for selected rows of a block.
+    """
+    wanted = set(int(row) for row in rows)
+    found = {}
+    with open(os.path.join(path, "ids.jsonl"), encoding="utf-8") as f:
+        for row, line in enumerate(f):
+            if row in wanted:
+                found[row] = json.loads(line)
+    return [found[int(row)] for row in rows]
+
+
+def vectorize_blocks(input_path, output_dir, engine="tfidf", model=None, n_features=2 ** 18, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Function to vectorize a JSON Lines corpus into sparse blocks, one chunk in memory at a time.
+
+    The "tfidf" engine needs the pre-fitted corpus model and writes finished
+    TF-IDF rows. The "hashing" engine writes raw hashed counts and merges each
+    block's document frequencies into one counter, since IDF weights are only
+    known after the last block; they are applied at scoring time.
+    """
+    if engine == "tfidf" and model is None:
+        raise ValueError("The tfidf engine needs the pre-fitted corpus model")
+
+    os.makedirs(output_dir, exist_ok=True)
+    hashing = scoring.HashingEngine(n_features=n_features) if engine == "hashing" else None
+    document_frequency = scoring.DocumentFrequency(n_features) if hashing else None
+    blocks = []
+    for number, records in enumerate(iter_chunks(iter_records(input_path), chunk_size)):
+        texts = [record["text"] for record in records]
+        if hashing:
+            matrix, block_frequency = hashing.count(texts)
+            document_frequency.merge(block_frequency)
+        else:
+            matrix = model["vectorizer"].transform(texts)
+        name = f"block-{number:05d}"
+        write_block(os.path.join(output_dir, name), matrix, records)
+        blocks.append({"name": name, "rows": len(records)})
+
+    meta = {"engine": engine, "blocks": blocks}
+    if hashing:
+        meta["n_features"] = n_features
+        meta["n_documents"] = document_frequency.n_documents
+        np.save(os.path.join(output_dir, "document_frequency.npy"), document_frequency.counts)
+    else:
+        meta["n_features"] = len(model["vectorizer"].vocabulary_)
+        meta["model_version"] = model["version"]
+    with open(os.path.join(output_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    return sum(block["rows"] for block in blocks)
+
+
+def score_blocks(blocks_dir, job_description, top_n=50, model=None):
+    """
+    Function to score a preprocessed job description against every block, keeping a running top-k.
+
+    Returns (candidate, score) pairs, best first.
+    """
+    with open(os.path.join(blocks_dir, "meta.json"), encoding="utf-8") as f:
+        meta = json.load(f)
+
+    idf = None
+    if meta["engine"] == "hashing":
+        hashing = scoring.HashingEngine(n_features=meta["n_features"])
+        document_frequency = scoring.DocumentFrequency(meta["n_features"])
+        document_frequency.counts = np.load(os.path.join(blocks_dir, "document_frequency.npy"))
+        document_frequency.n_documents = meta["n_documents"]
+        idf = document_frequency.idf()
+        query_counts, _ = hashing.count([job_description])
+        query = hashing.weight(query_counts, document_frequency)
+    else:
+        if model is None or model["version"] != meta["model_version"]:
+            raise ValueError("Blocks were vectorized with a different corpus model")
+        query = model["vectorizer"].transform([job_description])
+    query = np.asarray(query.toarray()).ravel().astype(np.float32)
+
+    best_positions = np.empty(0, dtype=np.int64)
+    best_scores = np.empty(0, dtype=np.float32)
+    offset = 0
+    for block in meta["blocks"]:
+        matrix = read_block(os.path.join(blocks_dir, block["name"]), meta["n_features"])
+        if idf is None:
+            scores = matrix.dot(query)
+        else:
+            # Hashed blocks hold raw counts: weight the query by IDF and divide by each row's weighted norm
+            weighted = matrix.multiply(idf).tocsr()
+            norms = np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel())
+            scores = weighted.dot(query) / np.where(norms > 0, norms, 1)
+        scores = np.asarray(scores, dtype=np.float32)
+
+        # Merge this block's best rows into the running top-k; positions keep upload order for ties
+        block_top = scoring.top_k_indices(scores, top_n)
+        positions = np.concatenate([best_positions, block_top + offset])
+        merged_scores = np.concatenate([best_scores, scores[block_top]])
+        keep = scoring.top_k_indices(merged_scores, top_n)
+        best_positions, best_scores = positions[keep], merged_scores[keep]
+        offset += block["rows"]
+        del matrix, scores
+
+    # Look up metadata only for the winners, one block at a time
+    starts = np.cumsum([0] + [block["rows"] for block in meta["blocks"]])
+    candidates = {}
+    block_numbers = np.searchsorted(starts, best_positions, side="right") - 1
+    for number in np.unique(block_numbers):
+        positions = best_positions[block_numbers == number]
+        rows = positions - starts[number]
+        path = os.path.join(blocks_dir, meta["blocks"][number]["name"])
+        for position, candidate in zip(positions, read_block_ids(path, rows)):
+            candidates[int(position)] = candidate
+    return [(candidates[int(position)], float(score)) for position, score in zip(best_positions, best_scores)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Out-of-core resume vectorization and scoring.")
+    parser.add_argument("--model", default=scoring.DEFAULT_MODEL_PATH, help="Corpus model file (tfidf engine)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    preprocess_parser = commands.add_parser("preprocess", help="Extract and preprocess resumes into JSON Lines")
+    preprocess_parser.add_argument("corpus", help="Directory of resumes (.pdf or .txt)")
+    preprocess_parser.add_argument("output", help="JSON Lines file to write")
+    vectorize_parser = commands.add_parser("vectorize", help="Vectorize a JSON Lines corpus into sparse blocks")
+    vectorize_parser.add_argument("input", help="JSON Lines file from the preprocess command")
+    vectorize_parser.add_argument("blocks", help="Directory to write blocks to")
+    vectorize_parser.add_argument("--engine", choices=["tfidf", "hashing"], default="tfidf")
+    vectorize_parser.add_argument("--n-features", type=int, default=2 ** 18, help="Hashed features (hashing engine)")
+    vectorize_parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    score_parser = commands.add_parser("score", help="Rank every block against a job description")
+    score_parser.add_argument("blocks", help="Directory written by the vectorize command")
+    score_parser.add_argument("job_description", help="Text file with the job description")
+    score_parser.add_argument("--top-n", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    if args.command == "preprocess":
+        count = preprocess_corpus(resume_processing.find_resume_files(args.corpus), args.output)
+        print(f"Preprocessed {count} resumes -> {args.output}")
+        return
+
+    model = scoring.ModelStore(args.model).get()
+    if args.command == "vectorize":
+        if args.engine == "tfidf" and model is None:
+            parser.error(f"No corpus model at {args.model}; run `python scoring.py <corpus_dir>` or use --engine hashing")
+        count = vectorize_blocks(args.input, args.blocks, args.engine, model, args.n_features, args.chunk_size)
+        print(f"Vectorized {count} resumes -> {args.blocks}")
+    elif args.command == "score":
+        with open(args.job_description, encoding="utf-8") as f:
+            job_description = resume_processing.preprocess(f.read())
+        for rank, (candidate, score) in enumerate(score_blocks(args.blocks, job_description, args.top_n, model), start=1):
+            print(f"{rank:>4}  {score * 100:6.2f}%  {candidate['name']}  ({candidate['id']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,489 @@
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+
+import numpy as np
+import scipy.sparse as sp
+
+import resume_processing
+import scoring
+
+DEFAULT_POOL_DIR = os.environ.get(
+    "RESUME_POOL_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "talent_pool"),
+)
+
+
+def write_segment(path, matrix, candidates, model_version):
+    """
+    Function to persist a CSR matrix of resume vectors plus candidate metadata.
+
+    The matrix is stored as raw .npy arrays so it can be memory mapped back
+    without loading the pool into RAM, together with its term-major postings
+    and per-term maximum weights for MaxScore retrieval. The directory is written next to its
+    final location and renamed into place, so readers never see a partial segment.
+    """
+    matrix = sp.csr_matrix(matrix, dtype=np.float32)
+    matrix.sort_indices()
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    os.makedirs(tmp_path, exist_ok=True)
+    np.save(os.path.join(tmp_path, "data.npy"), matrix.data.astype(np.float32))
+    np.save(os.path.join(tmp_path, "indices.npy"), matrix.indices.astype(np.int32))
+    np.save(os.path.join(tmp_path, "indptr.npy"), matrix.indptr.astype(np.int64))
+    index = scoring.InvertedIndex(matrix)
+    np.save(os.path.join(tmp_path, "postings_data.npy"), index.postings.data.astype(np.float32))
+    np.save(os.path.join(tmp_path, "postings_docs.npy"), index.postings.indices.astype(np.int32))
+    np.save(os.path.join(tmp_path, "postings_ptr.npy"), index.postings.indptr.astype(np.int64))
+    np.save(os.path.join(tmp_path, "term_max.npy"), index.term_max)
+    with open(os.path.join(tmp_path, "candidates.json"), "w", encoding="utf-8") as f:
+        json.dump(candidates, f)
+    with open(os.path.join(tmp_path, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump({"model_version": model_version, "shape": list(matrix.shape), "created_at": time.time()}, f)
+    os.replace(tmp_path, path)
+
+
+def new_segment_name():
+    """
+    Function to generate a unique, time-ordered segment directory name.
+    """
+    return f"seg-{time.time_ns()}"
+
+
+def read_manifest(path):
+    """
+    Function to read the list of live segments and their tombstoned rows.
+    """
+    with open(os.path.join(path, "manifest.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_manifest(path, manifest):
+    """
+    Function to replace the manifest atomically; it is the pool's single commit point.
+    """
+    tmp_path = os.path.join(path, f"manifest.json.{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, os.path.join(path, "manifest.json"))
+
+
+def manifest_stamp(path):
+    """
+    Function to get the manifest modification time, or None if the pool does not exist.
+    """
+    try:
+        return os.stat(os.path.join(path, "manifest.json")).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def remove_segment(path):
+    """
+    Function to delete a segment directory that is no longer in the manifest.
+    """
+    for name in os.listdir(path):
+        os.remove(os.path.join(path, name))
+    os.rmdir(path)
+
+
+class Segment:
+    """
+    A memory-mapped CSR block of resume vectors with its candidate metadata.
+
+    Segments are immutable once written; deletes are recorded as tombstones
+    in the pool manifest and applied at search time.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.name = os.path.basename(path)
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        with open(os.path.join(path, "candidates.json"), encoding="utf-8") as f:
+            self.candidates = json.load(f)
+        data = np.load(os.path.join(path, "data.npy"), mmap_mode="r")
+        indices = np.load(os.path.join(path, "indices.npy"), mmap_mode="r")
+        indptr = np.load(os.path.join(path, "indptr.npy"), mmap_mode="r")
+        self.matrix = sp.csr_matrix((data, indices, indptr), shape=tuple(self.meta["shape"]), copy=False)
+
+        if os.path.isfile(os.path.join(path, "term_max.npy")):
+            postings = sp.csc_matrix(
+                (
+                    np.load(os.path.join(path, "postings_data.npy"), mmap_mode="r"),
+                    np.load(os.path.join(path, "postings_docs.npy"), mmap_mode="r"),
+                    np.load(os.path.join(path, "postings_ptr.npy"), mmap_mode="r"),
+                ),
+                shape=self.matrix.shape,
+                copy=False,
+            )
+            self.index = scoring.InvertedIndex(self.matrix, postings, np.load(os.path.join(path, "term_max.npy")))
+        else:
+            # Segment written before postings were stored; build them in memory
+            self.index = scoring.InvertedIndex(self.matrix)
+
+    def __len__(self):
+        return self.matrix.shape[0]
+
+    def score(self, query):
+        """
+        Function to compute cosine scores for a dense, L2-normalized query vector.
+        """
+        return self.matrix.dot(query)
+
+
+class TalentPool:
+    """
+    Persisted index of vectorized resumes that a job description can be scored against.
+
+    The pool is a main segment plus small append-only segments listed in
+    manifest.json. Adds and updates write a new segment holding only the new
+    resumes, deletes add tombstones, and compaction merges everything back
+    into one segment in the background. A single writer process is assumed.
+    """
+
+    MAX_SEGMENTS = 8
+
+    def __init__(self, path=DEFAULT_POOL_DIR):
+        self.path = path
+        self._lock = threading.RLock()
+        self._compaction = None
+        self.manifest_stamp = manifest_stamp(path)
+        manifest = read_manifest(path)
+        self.model_version = manifest["model_version"]
+        self.segments = [Segment(os.path.join(path, name)) for name in manifest["segments"]]
+        self.tombstones = {name: set(rows) for name, rows in manifest["tombstones"].items()}
+        self._index_live()
+
+    def _index_live(self):
+        self._live = {}
+        for segment in self.segments:
+            self._index_segment(segment)
+
+    def _index_segment(self, segment):
+        # Later segments are newer, so their rows replace earlier rows with the same id
+        dead = self.tombstones.get(segment.name, ())
+        for row, candidate in enumerate(segment.candidates):
+            if row not in dead:
+                self._live[candidate["id"]] = (segment.name, row)
+
+    def _commit(self):
+        write_manifest(self.path, {
+            "model_version": self.model_version,
+            "segments": [segment.name for segment in self.segments],
+            "tombstones": {name: sorted(rows) for name, rows in self.tombstones.items() if rows},
+        })
+        self.manifest_stamp = manifest_stamp(self.path)
+
+    def refresh(self):
+        """
+        Function to catch up with a manifest changed by another process.
+
+        Segments already open are kept, so after an add only the new segment
+        is opened and only its rows and the new tombstones touch the live map.
+        A compaction or rebuild replaced segments, so the map is rebuilt then.
+        """
+        with self._lock:
+            stamp = manifest_stamp(self.path)
+            manifest = read_manifest(self.path)
+            opened = {segment.name: segment for segment in self.segments}
+            tombstones = {name: set(rows) for name, rows in manifest["tombstones"].items()}
+            segments = [opened.get(name) or Segment(os.path.join(self.path, name)) for name in manifest["segments"]]
+            names = set(manifest["segments"])
+
+            if manifest["model_version"] != self.model_version or not names.issuperset(opened):
+                self.model_version = manifest["model_version"]
+                self.segments, self.tombstones = segments, tombstones
+                self._index_live()
+            else:
+                for name, rows in tombstones.items():
+                    if name in opened:
+                        self._forget(opened[name], rows - self.tombstones.get(name, set()))
+                self.segments, self.tombstones = segments, tombstones
+                for segment in segments:
+                    if segment.name not in opened:
+                        self._index_segment(segment)
+            self.manifest_stamp = stamp
+
+    def __len__(self):
+        return len(self._live)
+
+    def __contains__(self, candidate_id):
+        return candidate_id in self._live
+
+    def _tombstone(self, candidate_ids):
+        for candidate_id in candidate_ids:
+            location = self._live.pop(candidate_id, None)
+            if location is not None:
+                segment_name, row = location
+                self.tombstones.setdefault(segment_name, set()).add(row)
+
+    def _forget(self, segment, rows):
+        # Drop tombstoned rows from the live map unless a newer row already replaced them
+        for row in rows:
+            candidate_id = segment.candidates[row]["id"]
+            if self._live.get(candidate_id) == (segment.name, row):
+                del self._live[candidate_id]
+
+    def add(self, candidates, matrix, model_version):
+        """
+        Function to add or update resumes by writing them as a new append-only segment.
+
+        Candidates whose id is already in the pool are replaced: the old row is
+        tombstoned and the new one is searched from the new segment.
+        """
+        if model_version != self.model_version:
+            raise ValueError(f"Pool was built with model {self.model_version}, not {model_version}")
+        if not candidates:
+            return
+        segment_path = os.path.join(self.path, new_segment_name())
+        write_segment(segment_path, matrix, candidates, model_version)
+        with self._lock:
+            self._tombstone(candidate["id"] for candidate in candidates)
+            segment = Segment(segment_path)
+            self.segments.append(segment)
+            self._index_segment(segment)
+            # An id repeated within the batch keeps its last row, so deleting it removes every copy
+            superseded = {row for row, candidate in enumerate(segment.candidates) if self._live[candidate["id"]] != (segment.name, row)}
+            if superseded:
+                self.tombstones[segment.name] = superseded
+            self._commit()
+        if len(self.segments) > self.MAX_SEGMENTS:
+            self.compact_async()
+
+    def delete(self, candidate_ids):
+        """
+        Function to remove resumes from the pool by tombstoning their rows.
+        """
+        with self._lock:
+            self._tombstone(candidate_ids)
+            self._commit()
+
+    def compact(self):
+        """
+        Function to merge all segments into one, dropping tombstoned rows.
+
+        The merged segment is written outside the lock so searches and adds
+        keep working; deletes that land on the old segments meanwhile are
+        carried over to the merged one before the manifest is swapped.
+        """
+        with self._lock:
+            snapshot = list(self.segments)
+            dead = {name: set(rows) for name, rows in self.tombstones.items()}
+        if len(snapshot) <= 1 and not any(dead.values()):
+            return
+
+        blocks, candidates, origin = [], [], []
+        for segment in snapshot:
+            removed = dead.get(segment.name, set())
+            keep = np.array([row for row in range(len(segment)) if row not in removed], dtype=np.int64)
+            blocks.append(segment.matrix[keep])
+            candidates.extend(segment.candidates[row] for row in keep)
+            origin.extend((segment.name, int(row)) for row in keep)
+        merged = sp.vstack(blocks, format="csr")
+        segment_path = os.path.join(self.path, new_segment_name())
+        write_segment(segment_path, merged, candidates, self.model_version)
+
+        with self._lock:
+            new_rows = {location: row for row, location in enumerate(origin)}
+            merged_names = {segment.name for segment in snapshot}
+            late = set()
+            for segment in snapshot:
+                for row in self.tombstones.get(segment.name, set()) - dead.get(segment.name, set()):
+                    late.add(new_rows[(segment.name, row)])
+            compacted = Segment(segment_path)
+            self.segments = [compacted] + [s for s in self.segments if s.name not in merged_names]
+            self.tombstones = {name: rows for name, rows in self.tombstones.items() if name not in merged_names}
+            if late:
+                self.tombstones[compacted.name] = late
+            self._commit()
+            # Every row moved, so the live map is rebuilt; compaction reads the whole pool anyway
+            self._index_live()
+
+        for segment in snapshot:
+            remove_segment(segment.path)
+
+    def compact_async(self):
+        """
+        Function to start compaction on a background thread unless one is already running.
+        """
+        with self._lock:
+            if self._compaction is not None and self._compaction.is_alive():
+                return self._compaction
+            self._compaction = threading.Thread(target=self.compact, name="talent-pool-compaction", daemon=True)
+            self._compaction.start()
+            return self._compaction
+
+    def search(self, query_vector, top_n=50, engine="scan"):
+        """
+        Function to find the top_n best-scoring candidates for a query vector.
+
+        The "scan" engine scores every resume with one sparse matrix-vector
+        product per segment and selects the top_n with argpartition. The
+        "maxscore" engine searches each segment's inverted index with MaxScore,
+        passing the running k-th best score on so later segments prune harder.
+        Both return the same ranking. Returns (candidate, score) pairs, best first.
+        """
+        exhaustive = engine == "scan"
+        query = np.asarray(query_vector.toarray()).ravel().astype(np.float32)
+        with self._lock:
+            segments = list(self.segments)
+            tombstones = {name: np.fromiter(rows, dtype=np.int64) for name, rows in self.tombstones.items()}
+            top_n = min(top_n, len(self._live))
+        if top_n <= 0:
+            return []
+
+        offsets = np.cumsum([0] + [len(segment) for segment in segments])
+        found_rows, found_scores = [], []
+        threshold = 0.0
+        for segment, offset in zip(segments, offsets):
+            dead = tombstones.get(segment.name)
+            if exhaustive:
+                rows = np.arange(len(segment))
+                scores = np.asarray(segment.score(query), dtype=np.float32)
+                if dead is not None:
+                    scores[dead] = -np.inf
+            else:
+                rows, scores = segment.index.top_k(query, top_n, threshold=threshold, excluded=dead)
+            found_rows.append(rows + offset)
+            found_scores.append(scores)
+            if not exhaustive and sum(len(r) for r in found_rows) >= top_n:
+                all_scores = np.concatenate(found_scores)
+                threshold = max(threshold, float(all_scores[scoring.top_k_indices(all_scores, top_n)[-1]]))
+
+        rows, scores = np.concatenate(found_rows), np.concatenate(found_scores)
+        # Order by pool position so ties break the same way for both engines
+        order = np.argsort(rows, kind="stable")
+        rows, scores = rows[order], scores[order]
+        top = scoring.top_k_indices(scores, top_n)
+
+        results = []
+        for i, score in zip(rows[top], scores[top]):
+            segment_index = np.searchsorted(offsets, i, side="right") - 1
+            row = i - offsets[segment_index]
+            results.append((segments[segment_index].candidates[row], float(score)))
+        return results
+
+
+def load_pool(path=DEFAULT_POOL_DIR):
+    """
+    Function to open the talent pool, or return None if it has not been built.
+    """
+    if not os.path.isfile(os.path.join(path, "manifest.json")):
+        return None
+    return TalentPool(path)
+
+
+class PoolStore:
+    """
+    Keeps the opened talent pool and refreshes it when another process changes it on disk.
+
+    Writes made through the returned pool update its own manifest stamp, so
+    they do not trigger a refresh here. A refresh opens only the segments
+    added since, see TalentPool.refresh().
+    """
+
+    def __init__(self, path=DEFAULT_POOL_DIR):
+        self.path = path
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        """
+        Function to return the current talent pool, or None if none has been built.
+        """
+        with self._lock:
+            stamp = manifest_stamp(self.path)
+            if stamp is None:
+                self._pool = None
+            elif self._pool is None:
+                self._pool = TalentPool(self.path)
+            elif stamp != self._pool.manifest_stamp:
+                self._pool.refresh()
+            return self._pool
+
+
+def vectorize_files(paths, model):
+    """
+    Function to read, preprocess and vectorize resume files with the corpus model.
+    """
+    candidates, documents = [], []
+    for file_path in paths:
+        try:
+            processed_text = resume_processing.preprocess(resume_processing.read_resume_file(file_path))
+        except Exception as e:
+            print(f"Skipping {file_path}: {e}", file=sys.stderr)
+            continue
+        if processed_text:
+            candidates.append({"id": file_path, "name": os.path.basename(file_path)})
+            documents.append(processed_text)
+    if not documents:
+        # The vectorizer rejects an empty batch; an empty pool is still a valid pool
+        return candidates, sp.csr_matrix((0, len(model["vectorizer"].vocabulary_)), dtype=np.float32)
+    return candidates, model["vectorizer"].transform(documents)
+
+
+def build_pool(paths, model, path=DEFAULT_POOL_DIR):
+    """
+    Function to vectorize resume files with the corpus model and write them as a fresh pool.
+    """
+    candidates, matrix = vectorize_files(paths, model)
+    os.makedirs(path, exist_ok=True)
+    previous = read_manifest(path)["segments"] if os.path.isfile(os.path.join(path, "manifest.json")) else []
+
+    segment_name = new_segment_name()
+    write_segment(os.path.join(path, segment_name), matrix, candidates, model["version"])
+    write_manifest(path, {"model_version": model["version"], "segments": [segment_name], "tombstones": {}})
+    for name in previous:
+        remove_segment(os.path.join(path, name))
+    return len(candidates)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build and maintain the persisted talent-pool index.")
+    parser.add_argument("--pool", default=DEFAULT_POOL_DIR, help="Talent pool directory")
+    parser.add_argument("--model", default=scoring.DEFAULT_MODEL_PATH, help="Corpus model file")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build_parser = commands.add_parser("build", help="Index a directory of resumes as a fresh pool")
+    build_parser.add_argument("corpus", help="Directory of resumes (.pdf or .txt) to index")
+    add_parser = commands.add_parser("add", help="Add or update resumes (file paths are their ids)")
+    add_parser.add_argument("files", nargs="+", help="Resume files (.pdf or .txt)")
+    delete_parser = commands.add_parser("delete", help="Remove resumes by id")
+    delete_parser.add_argument("ids", nargs="+", help="Candidate ids to remove")
+    commands.add_parser("compact", help="Merge all segments and drop deleted resumes")
+    args = parser.parse_args(argv)
+
+    if args.command in ("build", "add"):
+        model = scoring.ModelStore(args.model).get()
+        if model is None:
+            parser.error(f"No corpus model at {args.model}; run `python scoring.py <corpus_dir>` first")
+
+    if args.command == "build":
+        count = build_pool(resume_processing.find_resume_files(args.corpus), model, args.pool)
+        print(f"Indexed {count} resumes with model {model['version']} -> {args.pool}")
+        return
+
+    pool = load_pool(args.pool)
+    if pool is None:
+        parser.error(f"No talent pool at {args.pool}; run `python talent_pool.py build <corpus_dir>` first")
+
+    if args.command == "add":
+        candidates, matrix = vectorize_files(args.files, model)
+        pool.add(candidates, matrix, model["version"])
+        print(f"Added {len(candidates)} resumes ({len(pool)} in pool, {len(pool.segments)} segments)")
+    elif args.command == "delete":
+        pool.delete(args.ids)
+        print(f"{len(pool)} resumes in pool")
+    elif args.command == "compact":
+        pool.compact()
+        print(f"Compacted to {len(pool.segments)} segment(s), {len(pool)} resumes")
+
+    # Wait for any compaction triggered by the add before exiting
+    if pool._compaction is not None:
+        pool._compaction.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import resume_processing
+
+RESUME = """Jane Doe
+Technical Skills
+Languages: Python, Java, SQL
+Frameworks: Django, React
+Tools: Docker, Git
+Experience
+Backend Engineer at Acme
+Languages
+English, French
+"""
+
+
+def section_text(raw_text, name):
+    return "".join(raw_text[start:end] for section, start, end in resume_processing.find_sections(raw_text) if section == name)
+
+
+def test_labelled_lines_stay_in_skills_block():
+    skills = section_text(RESUME, "skills")
+    assert "Languages: Python, Java, SQL" in skills
+    assert "Frameworks: Django, React" in skills
+    assert "Tools: Docker, Git" in skills
+    assert "Backend Engineer" not in skills
+
+
+def test_bare_heading_still_ends_section():
+    experience = section_text(RESUME, "experience")
+    assert experience.strip() == "Backend Engineer at Acme"
+
+
+def test_colon_heading_starts_section():
+    sections = resume_processing.find_sections("Summary: Data analyst\nSkills: SQL, Excel\nLanguages:\nEnglish\n")
+    assert [name for name, _, _ in sections] == ["summary", "skills"]
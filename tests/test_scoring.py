@@ -0,0 +1,38 @@
+import os
+import sys
+
+import numpy as np
+import scipy.sparse as sp
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scoring
+
+
+def full_sort(query, matrix, top_n):
+    """
+    Function to rank every row's contributions with one stable sort, as the reference.
+    """
+    query = sp.csr_matrix(query)
+    query.sort_indices()
+    dense = (matrix[:, query.indices] @ sp.diags(query.data)).toarray()
+    picked = np.argsort(-dense, axis=1, kind="stable")[:, :top_n]
+    return [[int(query.indices[j]) for j in row if dense[i, j] > 0] for i, row in enumerate(picked)]
+
+
+def ranked_columns(query, matrix, top_n):
+    indptr, columns, _ = scoring.top_contributions(query, matrix, top_n)
+    return [columns[indptr[i]:indptr[i + 1]].tolist() for i in range(matrix.shape[0])]
+
+
+def test_top_contributions_breaks_ties_by_column():
+    # Every row weighs several query terms equally, so the cut at top_n falls inside a tie
+    rng = np.random.default_rng(0)
+    matrix = sp.csr_matrix(rng.integers(0, 3, size=(50, 40)).astype(float))
+    query = sp.csr_matrix(np.ones((1, 40)))
+    for top_n in (3, 15):
+        # 40 query terms: argpartition for top 3, the full sort for top 15
+        assert ranked_columns(query, matrix, top_n) == full_sort(query, matrix, top_n)
+
+    rows = sp.csr_matrix(np.array([[0, 1, 1, 1, 1, 1, 2, 1, 1, 1, 1, 1]], dtype=float))
+    assert ranked_columns(sp.csr_matrix(np.ones((1, 12))), rows, 2) == [[6, 1]]
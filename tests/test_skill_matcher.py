@@ -0,0 +1,56 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import skill_matcher
+from skill_matcher import SkillMatcher
+
+SKILLS = """
+# name | aliases
+Machine Learning | ML
+Learning
+Deep Learning
+Java
+JavaScript | JS
+C++
+Node.js | node
+Front End
+"""
+
+
+def compile_matcher():
+    return SkillMatcher.compile(skill_matcher.parse_skills(SKILLS))
+
+
+def test_overlapping_skills_are_all_found():
+    text = "Built deep machine learning models"
+    hits = compile_matcher().find(text)
+    assert sorted((name, text[start:end]) for name, start, end in hits) == [
+        ("Learning", "learning"),
+        ("Machine Learning", "machine learning"),
+    ]
+
+    hits = compile_matcher().find("Deep learning")
+    assert [name for name, _, _ in hits] == ["Deep Learning", "Learning"]
+
+
+def test_skills_match_whole_words_only():
+    matcher = compile_matcher()
+    assert matcher.skills("Senior JavaScript developer") == ["JavaScript"]
+    assert matcher.skills("Javanese speaker, relearning C") == []
+    assert matcher.skills("Java, C++ and node.js; front-end work") == ["Java", "C++", "Node.js", "Front End"]
+    assert matcher.skills("ML and JS") == ["Machine Learning", "JavaScript"]
+
+
+def test_compiled_matcher_round_trips_through_the_cache(tmp_path):
+    skills_path = tmp_path / "skills.txt"
+    skills_path.write_text(SKILLS, encoding="utf-8")
+    cache_dir = str(tmp_path / "cache")
+
+    compiled = skill_matcher.load_matcher(str(skills_path), cache_dir)
+    assert [name for name in os.listdir(cache_dir) if name.endswith(".pickle")]
+    loaded = skill_matcher.load_matcher(str(skills_path), cache_dir)
+    assert loaded is not compiled
+    text = "Machine learning in Java and node.js for the front end"
+    assert loaded.find(text) == compiled.find(text) == compile_matcher().find(text)
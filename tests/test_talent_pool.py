@@ -0,0 +1,49 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scoring
+import talent_pool
+
+RESUMES = {
+    "analyst.txt": "Data analyst skilled in SQL, Excel and Tableau dashboards.",
+    "engineer.txt": "Backend engineer building Python and Django services on AWS.",
+    "designer.txt": "Product designer working in Figma on user research and prototypes.",
+}
+
+
+def fit_model():
+    return scoring.fit_corpus_model([text.lower().split() for text in RESUMES.values()])
+
+
+def test_build_empty_pool(tmp_path):
+    pool_dir = str(tmp_path / "pool")
+    assert talent_pool.build_pool([], fit_model(), pool_dir) == 0
+
+    pool = talent_pool.load_pool(pool_dir)
+    assert len(pool) == 0
+    assert not [name for name in os.listdir(pool_dir) if name.endswith(".tmp")]
+    query = fit_model()["vectorizer"].transform([["python"]])
+    assert pool.search(query, engine="scan") == []
+    assert pool.search(query, engine="maxscore") == []
+
+
+def test_compact_after_deleting_everyone(tmp_path):
+    model = fit_model()
+    pool_dir = str(tmp_path / "pool")
+    talent_pool.build_pool([], model, pool_dir)
+    pool = talent_pool.load_pool(pool_dir)
+    candidates = [{"id": name, "name": name} for name in RESUMES]
+    pool.add(candidates, model["vectorizer"].transform([text.lower().split() for text in RESUMES.values()]), model["version"])
+    assert len(pool) == len(RESUMES)
+
+    pool.delete(list(RESUMES))
+    pool.compact()
+
+    assert len(pool) == 0
+    assert len(pool.segments) == 1 and len(pool.segments[0]) == 0
+    assert not [name for name in os.listdir(pool_dir) if name.endswith(".tmp")]
+    reopened = talent_pool.load_pool(pool_dir)
+    assert len(reopened) == 0
+    assert reopened.search(model["vectorizer"].transform([["python"]]), engine="maxscore") == []
@@ -0,0 +1,126 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+
+DEFAULT_CACHE_DIR = os.environ.get("RESUME_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache"))
+DEFAULT_MAX_BYTES = int(os.environ.get("RESUME_TEXT_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+
+
+class TextCache:
+    """
+    Content-addressed SQLite cache of extracted and preprocessed resume text.
+
+    Entries are keyed by the SHA-256 of the uploaded bytes plus the extractor
+    version and preprocessing variant, and the least recently used entries are evicted once the stored
+    text exceeds max_bytes. Section spans of the analysis record are stored
+    alongside the texts.
+    """
+
+    def __init__(self, path=None, max_bytes=DEFAULT_MAX_BYTES, version=""):
+        if path is None:
+            os.makedirs(DEFAULT_CACHE_DIR, exist_ok=True)
+            path = os.path.join(DEFAULT_CACHE_DIR, "resume_text.sqlite3")
+        self.path = path
+        self.max_bytes = max_bytes
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS texts (
+                key TEXT PRIMARY KEY,
+                raw_text TEXT NOT NULL,
+                processed_text TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL,
+                sections TEXT NOT NULL DEFAULT '{}'
+            )
+            """
+        )
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(texts)")]
+        if "sections" not in columns:
+            self._conn.execute("ALTER TABLE texts ADD COLUMN sections TEXT NOT NULL DEFAULT '{}'")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS texts_last_access ON texts (last_access)")
+        self._conn.commit()
+
+    def make_key(self, digest, variant=""):
+        """
+        Function to build the cache key from the SHA-256 hex digest of an upload.
+
+        variant names preprocessing options (such as the tokenizer) that change
+        the stored processed text.
+        """
+        key = digest + ":" + self.version
+        return key + ":" + variant if variant else key
+
+    def get(self, key):
+        """
+        Function to look up (raw_text, processed_text, sections) for a key, or None on a miss.
+        """
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT raw_text, processed_text, sections FROM texts WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute("UPDATE texts SET last_access = ? WHERE key = ?", (time.time(), key))
+                    self._conn.commit()
+            except sqlite3.Error:
+                row = None
+
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return row[0], row[1], json.loads(row[2])
+
+    def put(self, key, raw_text, processed_text, sections=None):
+        """
+        Function to store the texts for a key and evict old entries if over budget.
+        """
+        size = len(raw_text.encode("utf-8")) + len(processed_text.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO texts (key, raw_text, processed_text, size, last_access, sections) VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, raw_text, processed_text, size, time.time(), json.dumps(sections or {})),
+                )
+                self._evict()
+                self._conn.commit()
+            except sqlite3.Error:
+                self._conn.rollback()
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM texts").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT key, size FROM texts ORDER BY last_access ASC").fetchall()
+        stale = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM texts WHERE key = ?", stale)
+
+    def stats(self):
+        """
+        Function to report hit/miss counters and the current cache size.
+        """
+        with self._lock:
+            entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM texts").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "size_bytes": size,
+        }
@@ -0,0 +1,96 @@
+import os
+import sys
+import time
+import argparse
+import threading
+
+import resume_processing
+import scoring
+
+
+class Warmup:
+    """
+    Runs start-up tasks on a background thread and reports their readiness.
+
+    Each task is a (name, function) pair run in order; its status moves from
+    "pending" to "loading" to "ready" or "failed", with the error message kept
+    for failed tasks. Pages can show the status while the thread runs and
+    wait() for it before doing work that needs the loaded resources.
+    """
+
+    def __init__(self, tasks):
+        self.tasks = list(tasks)
+        self.status = {name: "pending" for name, _ in self.tasks}
+        self.errors = {}
+        self.seconds = {}
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self.run, name="warmup", daemon=True)
+
+    def start(self):
+        """
+        Function to start the tasks on the background thread.
+        """
+        self._thread.start()
+        return self
+
+    def run(self):
+        """
+        Function to run every task in order on the calling thread.
+        """
+        for name, func in self.tasks:
+            self.status[name] = "loading"
+            start = time.perf_counter()
+            try:
+                func()
+                self.status[name] = "ready"
+            except Exception as e:
+                self.status[name] = "failed"
+                self.errors[name] = str(e)
+            self.seconds[name] = time.perf_counter() - start
+        self._done.set()
+        return self
+
+    def wait(self, timeout=None):
+        """
+        Function to block until every task has finished, returning False on timeout.
+        """
+        return self._done.wait(timeout)
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    @property
+    def ready(self):
+        return all(status == "ready" for status in self.status.values())
+
+
+def default_tasks(model_store=None):
+    """
+    Function to list the start-up tasks: NLTK data and PDF extraction, the scoring engine, the corpus model
+    and, on multi-core machines where parallel extraction is the default, the extraction workers.
+    """
+    tasks = [
+        ("Language models", resume_processing.warm_up),
+        ("Scoring engine", scoring.warm_up),
+    ]
+    if model_store is not None:
+        tasks.append(("Corpus model", model_store.get))
+    if (os.cpu_count() or 1) > 1:
+        tasks.append(("Extraction workers", resume_processing.warm_up_workers))
+    return tasks
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check and load everything resume screening needs, as the app does at start-up.")
+    parser.add_argument("--model", default=scoring.DEFAULT_MODEL_PATH, help="Corpus model file to load")
+    args = parser.parse_args(argv)
+
+    warmup = Warmup(default_tasks(scoring.ModelStore(args.model))).run()
+    for name, status in warmup.status.items():
+        print(f"{name:<18}{status:<8}{warmup.seconds[name]:>7.2f}s  {warmup.errors.get(name, '')}")
+    return 0 if warmup.ready else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())